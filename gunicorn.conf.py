@@ -10,6 +10,22 @@ bind = "0.0.0.0:8000"
 # 工作进程数量，可按 CPU 核心数调整
 workers = 4
 
+# 安装了 gevent 时使用协程 worker：I/O 等待期间单个进程即可维持大量连接
+worker_class = "sync"
+try:
+    import gevent  # noqa: F401
+except ImportError:
+    pass
+else:
+    worker_class = "gevent"
+    worker_connections = 1000
+    keepalive = 5
+
+# 在 master 中预先创建应用，worker fork 后通过写时复制共享导入的模块和数据。
+# gevent worker 例外：它在 fork 之后才 monkey patch，master 中提前导入的
+# requests/urllib3/ssl 不会被正确替换，因此由每个 worker 自行加载应用
+preload_app = worker_class != "gevent"
+
 # 超时时间（秒），防止长时间挂起
 timeout = 120
 
@@ -3,6 +3,8 @@
 一个用于爬取航空公司座位图的Python包。
 """
 
+import importlib
+
 __version__ = "0.2.0"
 
 # 导出统一配置模块
@@ -11,15 +13,29 @@ from .config import Config, CrawlerConfig, APIConfig, LoggingConfig, ImageConfig
 # 导出航司管理模块
 from .airlines import AirlineManager, get_airline_info, get_all_airlines, get_supported_iata_codes
 
-# 导出统一爬虫实现
-from .aerolopa_crawler import AerolopaCrawler
-
 # 导出CLI模块
 from . import cli
 
-# 导出API模块
-from . import api
-from .api import create_app, run_app, APIError
+# 爬虫实现和API模块依赖较重（requests、lxml、Flask、Pillow 等），
+# 首次访问时才导入，命令行的 --list-airlines 等操作无需加载
+_LAZY_EXPORTS = {
+    'AerolopaCrawler': ('.aerolopa_crawler', 'AerolopaCrawler'),
+    'api': ('.api', None),
+    'create_app': ('.api', 'create_app'),
+    'run_app': ('.api', 'run_app'),
+    'APIError': ('.api', 'APIError'),
+}
+
+
+def __getattr__(name):
+    try:
+        module_name, attr = _LAZY_EXPORTS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    module = importlib.import_module(module_name, __name__)
+    value = module if attr is None else getattr(module, attr)
+    globals()[name] = value
+    return value
 
 __all__ = [
     # 版本信息
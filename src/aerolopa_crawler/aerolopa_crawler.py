@@ -5,19 +5,77 @@ crawler architecture, providing seat map crawling capabilities.
 """
 from __future__ import annotations
 
+import atexit
+import hashlib
+import html
+import itertools
 import logging
 import sqlite3
 import os
 import re
+import threading
 import time
-from typing import Dict, List, Optional, Set, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
 from urllib.parse import urljoin, urlparse
 
+import lxml.etree
+import lxml.html
 import requests
 from bs4 import BeautifulSoup
+from urllib3.util.request import ACCEPT_ENCODING
+
+try:
+    import ahocorasick  # type: ignore
+except ImportError:
+    # Optional dependency; fall back to a plain substring scan.
+    ahocorasick = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser  # type: ignore
+except ImportError:
+    # Optional dependency; fall back to BeautifulSoup / lxml.
+    LexborHTMLParser = None
 
 from .config import Config
 from .airlines import AirlineManager
+from .throttle import RateLimiter
+
+
+# Patterns and lookup tables used for every extracted link and image
+_NON_ALNUM = re.compile(r'[^A-Z0-9]')
+_NON_FILENAME = re.compile(r'[^a-zA-Z0-9._-]')
+_VALID_EXTS = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg')
+_IMG_KEYWORDS = frozenset(('seat', 'map', 'layout', 'cabin', 'aircraft'))
+
+_AIRLINE_LINK_SELECTORS = (
+    'a[href*="airline"]',
+    'a[href*="carrier"]',
+    '.airline-link',
+    '.carrier-link',
+)
+_AIRCRAFT_LINK_SELECTORS = (
+    'a[href*="aircraft"]',
+    'a[href*="seatmap"]',
+    'a[href*="seat-map"]',
+    '.aircraft-link',
+    '.seatmap-link',
+)
+# Seat map images: src/alt mentions seat or map, or inside a layout container
+_SEAT_MAP_IMG_HINTS = ('seat', 'map')
+_SEAT_MAP_CONTAINER_CLASSES = frozenset(('seatmap', 'seat-map', 'aircraft-layout'))
+_SEAT_MAP_IMG_SELECTOR = ', '.join((
+    'img[src*="seat"]',
+    'img[src*="map"]',
+    'img[alt*="seat"]',
+    'img[alt*="map"]',
+    '.seatmap img',
+    '.seat-map img',
+    '.aircraft-layout img',
+))
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset=["\']?([\w.:-]+)', re.IGNORECASE)
+_TITLE_RE = re.compile(rb'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
 
 
 class AerolopaCrawler:
@@ -31,6 +89,9 @@ class AerolopaCrawler:
     - Progress tracking
     """
     
+    # Number of inserted rows buffered before a SQLite commit
+    DB_COMMIT_EVERY = 1000
+    
     def __init__(self, config: Optional[Config] = None):
         """Initialize the AeroLOPA crawler.
         
@@ -45,6 +106,8 @@ class AerolopaCrawler:
         self.logger = self._setup_logging()
         
         # Create output directories
+        self._cache_dir = Path(self.config.image.cache_dir)
+        self._filename_counter = itertools.count()
         self._ensure_directories()
         
         # Initialize SQLite database
@@ -52,7 +115,49 @@ class AerolopaCrawler:
         self._init_db()
         
         # Track processed URLs to avoid duplicates
+        # Claimed under the lock before fetching, so concurrent crawls (the
+        # crawl_all_airlines workers, the API task pool) never process a page twice
         self.processed_urls: Set[str] = set()
+        self._processed_urls_lock = threading.Lock()
+        
+        # Images already downloaded (SHA1 of URL -> local path), persisted in
+        # a sidecar file so restarts and other airlines reuse them
+        self._image_index_file = os.path.join(self.config.crawler.output_dir, "downloaded.txt")
+        self.processed_images: Dict[str, str] = self._load_image_index()
+        self._image_index_lock = threading.Lock()
+        self._image_index_fh = open(self._image_index_file, 'a', encoding='utf-8')
+        
+        # Upper-cased keyword -> (model_rank, model); the first model listing
+        # a keyword wins, matching config-order precedence
+        self._aircraft_kw_rank: Dict[str, Tuple[int, str]] = {}
+        for rank, (model, keywords) in enumerate(self.config.aircraft_keywords.items()):
+            for keyword in keywords:
+                if keyword:
+                    self._aircraft_kw_rank.setdefault(keyword.upper(), (rank, model))
+        self._aircraft_ac = self._build_aircraft_automaton()
+        self._aircraft_re = None if self._aircraft_ac is not None else self._build_aircraft_regex()
+        # Shared by every worker so the aggregate request rate stays polite
+        self._limiter = RateLimiter(*self.config.crawler.rate_limit())
+        self._fast_parser = bool(self.config.crawler.fast_parser and LexborHTMLParser is not None)
+        
+        # Images on one aircraft page are downloaded concurrently; DB writes
+        # stay serialized.
+        self._download_pool = ThreadPoolExecutor(
+            max_workers=self.config.image.download_concurrency or 8
+        )
+        self._db_lock = threading.Lock()
+        
+        # One long-lived connection; rows are committed in batches and WAL
+        # with synchronous=NORMAL avoids an fsync on every commit
+        self._db_conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self._db_conn.execute("PRAGMA journal_mode=WAL")
+        self._db_conn.execute("PRAGMA synchronous=NORMAL")
+        self._rows_since_commit = 0
+        # Live row count, seeded once so statistics never re-count the table
+        row = self._db_conn.execute("SELECT COUNT(*) FROM seatmaps").fetchone()
+        self._db_rows = int(row[0]) if row else 0
+        self._closed = False
+        atexit.register(self.close)
         
     def _create_session(self) -> requests.Session:
         """Create and configure requests session."""
@@ -61,7 +166,8 @@ class AerolopaCrawler:
             'User-Agent': self.config.crawler.user_agent,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
+            # Includes br (Brotli) when urllib3 can decode it
+            'Accept-Encoding': ACCEPT_ENCODING,
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1',
         })
@@ -97,7 +203,7 @@ class AerolopaCrawler:
     def _ensure_directories(self) -> None:
         """Ensure output directories exist."""
         os.makedirs(self.config.crawler.output_dir, exist_ok=True)
-        os.makedirs(self.config.image.cache_dir, exist_ok=True)
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
     
     def _init_db(self) -> None:
         """Initialize SQLite database and tables."""
@@ -137,12 +243,46 @@ class AerolopaCrawler:
         """Deprecated: use SQLite instead."""
         self._init_db()
     
+    def _load_image_index(self) -> Dict[str, str]:
+        """Load the downloaded-image index written by previous runs."""
+        index: Dict[str, str] = {}
+        if not os.path.exists(self._image_index_file):
+            return index
+        with open(self._image_index_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                digest, _, path = line.rstrip('\n').partition(' ')
+                if digest and path:
+                    index[digest] = path
+        return index
+    
+    def _claim_url(self, url: str) -> bool:
+        """Atomically mark a page as processed; False if another crawl has it."""
+        with self._processed_urls_lock:
+            if url in self.processed_urls:
+                return False
+            self.processed_urls.add(url)
+            return True
+    
+    def _release_url(self, url: str) -> None:
+        """Give up a claimed page (e.g. its fetch failed) so it can be retried."""
+        with self._processed_urls_lock:
+            self.processed_urls.discard(url)
+    
+    def _remember_image(self, digest: str, file_path: str) -> None:
+        """Record a downloaded image in memory and in the sidecar file."""
+        with self._image_index_lock:
+            self.processed_images[digest] = file_path
+            self._image_index_fh.write(f"{digest} {file_path}\n")
+            self._image_index_fh.flush()
+    
     def _write_to_db(self, data: Dict[str, str]) -> None:
-        """Write data to SQLite database."""
-        conn = sqlite3.connect(self.db_file)
-        try:
-            cur = conn.cursor()
-            cur.execute(
+        """Write data to SQLite database.
+        
+        Rows are committed every ``DB_COMMIT_EVERY`` inserts and whenever
+        :meth:`flush` or :meth:`close` is called.
+        """
+        with self._db_lock:
+            cursor = self._db_conn.execute(
                 """
                 INSERT OR IGNORE INTO seatmaps (
                     airline_iata,
@@ -170,111 +310,192 @@ class AerolopaCrawler:
                     data.get('description', ''),
                 ),
             )
-            conn.commit()
-        finally:
-            conn.close()
+            # rowcount is 0 when the unique index ignored a duplicate
+            self._db_rows += cursor.rowcount
+            self._rows_since_commit += 1
+            if self._rows_since_commit >= self.DB_COMMIT_EVERY:
+                self._db_conn.commit()
+                self._rows_since_commit = 0
+    
+    def flush(self) -> None:
+        """Commit any pending database rows."""
+        with self._db_lock:
+            if self._rows_since_commit:
+                self._db_conn.commit()
+                self._rows_since_commit = 0
+    
+    def close(self) -> None:
+        """Flush pending rows and release the database and download pool."""
+        if self._closed:
+            return
+        self._closed = True
+        self._download_pool.shutdown(wait=True)
+        self.flush()
+        with self._db_lock:
+            self._db_conn.close()
+        with self._image_index_lock:
+            self._image_index_fh.close()
+        atexit.unregister(self.close)
+    
+    def __enter__(self) -> "AerolopaCrawler":
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
     
     def _write_to_csv(self, data: Dict[str, str]) -> None:
         """Deprecated: use SQLite instead."""
         self._write_to_db(data)
     
-    def _fetch_page(self, url: str) -> Optional[BeautifulSoup]:
-        """Fetch and parse a web page.
+    def _fetch_html(self, url: str) -> Optional[Tuple[bytes, Optional[str]]]:
+        """Fetch a web page without decoding it.
+        
+        The body is not run through chardet; the charset comes from the
+        Content-Type header or the page's ``<meta>`` declaration, and
+        detection is only used for undeclared pages that are not UTF-8.
         
         Args:
             url: URL to fetch
             
         Returns:
-            BeautifulSoup object or None if failed
+            (raw body, charset or None for UTF-8), or None if failed
         """
         try:
             self.logger.debug(f"Fetching: {url}")
+            self._limiter.acquire()
             response = self.session.get(
-                url, 
+                url,
                 timeout=self.config.crawler.timeout,
                 allow_redirects=True
             )
             response.raise_for_status()
+            content = response.content
+            if 'charset=' in response.headers.get('Content-Type', ''):
+                return content, response.encoding
             
-            # Detect encoding
-            response.encoding = response.apparent_encoding or 'utf-8'
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            return soup
+            match = _META_CHARSET_RE.search(content, 0, 2048)
+            if match:
+                return content, match.group(1).decode('ascii')
+            try:
+                content.decode('utf-8')
+                return content, None
+            except UnicodeDecodeError:
+                return content, response.apparent_encoding
             
         except requests.RequestException as e:
             self.logger.error(f"Failed to fetch {url}: {e}")
             return None
-        except Exception as e:
-            self.logger.error(f"Error parsing {url}: {e}")
-            return None
     
-    def _extract_airline_links(self, soup: BeautifulSoup, base_url: str) -> List[Tuple[str, str]]:
+    @staticmethod
+    def _decode_html(html_bytes: bytes, charset: Optional[str]) -> str:
+        """Decode a page body with the HTTP charset, falling back to UTF-8."""
+        try:
+            return html_bytes.decode(charset or 'utf-8', errors='replace')
+        except LookupError:
+            return html_bytes.decode('utf-8', errors='replace')
+    
+    def _iter_links(
+        self, html_bytes: bytes, selectors: Sequence[str], charset: Optional[str] = None
+    ) -> Iterator[Tuple[str, str]]:
+        """Yield (href, text) for every link matching the selectors, in selector order."""
+        # Decode up front so neither parser runs its own charset detection
+        text = self._decode_html(html_bytes, charset)
+        if self._fast_parser:
+            tree = LexborHTMLParser(text)
+            for pattern in selectors:
+                for node in tree.css(pattern):
+                    href = node.attributes.get('href')
+                    if href:
+                        yield href, node.text(strip=True)
+        else:
+            soup = BeautifulSoup(text, 'html.parser')
+            for pattern in selectors:
+                for link in soup.select(pattern):
+                    href = link.get('href')
+                    if href:
+                        yield href, link.get_text(strip=True)
+    
+    def _extract_airline_links(
+        self, html_bytes: bytes, base_url: str, charset: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
         """Extract airline links from the main page.
         
         Args:
-            soup: BeautifulSoup object of the main page
+            html_bytes: Raw HTML of the main page
             base_url: Base URL for resolving relative links
+            charset: Charset from the HTTP headers, if any
             
         Returns:
             List of (airline_name, airline_url) tuples
         """
         airline_links = []
+        seen_urls: Set[str] = set()
         
         # Look for airline links in various patterns
-        patterns = [
-            'a[href*="airline"]',
-            'a[href*="carrier"]',
-            '.airline-link',
-            '.carrier-link'
-        ]
-        
-        for pattern in patterns:
-            links = soup.select(pattern)
-            for link in links:
-                href = link.get('href')
-                if href:
-                    full_url = urljoin(base_url, href)
-                    airline_name = link.get_text(strip=True)
-                    if airline_name and full_url not in [url for _, url in airline_links]:
-                        airline_links.append((airline_name, full_url))
+        for href, airline_name in self._iter_links(html_bytes, _AIRLINE_LINK_SELECTORS, charset):
+            full_url = urljoin(base_url, href)
+            if airline_name and full_url not in seen_urls:
+                seen_urls.add(full_url)
+                airline_links.append((airline_name, full_url))
         
         return airline_links
     
-    def _extract_aircraft_links(self, soup: BeautifulSoup, base_url: str) -> List[Tuple[str, str]]:
+    def _extract_aircraft_links(
+        self, html_bytes: bytes, base_url: str, charset: Optional[str] = None
+    ) -> List[Tuple[str, str]]:
         """Extract aircraft model links from airline page.
         
         Args:
-            soup: BeautifulSoup object of the airline page
+            html_bytes: Raw HTML of the airline page
             base_url: Base URL for resolving relative links
+            charset: Charset from the HTTP headers, if any
             
         Returns:
             List of (aircraft_model, aircraft_url) tuples
         """
         aircraft_links = []
+        seen_urls: Set[str] = set()
         
         # Look for aircraft links
-        patterns = [
-            'a[href*="aircraft"]',
-            'a[href*="seatmap"]',
-            'a[href*="seat-map"]',
-            '.aircraft-link',
-            '.seatmap-link'
-        ]
-        
-        for pattern in patterns:
-            links = soup.select(pattern)
-            for link in links:
-                href = link.get('href')
-                if href:
-                    full_url = urljoin(base_url, href)
-                    # Try to extract aircraft model from text or URL
-                    aircraft_model = self._extract_aircraft_model(link.get_text(strip=True), href)
-                    if aircraft_model and full_url not in [url for _, url in aircraft_links]:
-                        aircraft_links.append((aircraft_model, full_url))
+        for href, text in self._iter_links(html_bytes, _AIRCRAFT_LINK_SELECTORS, charset):
+            full_url = urljoin(base_url, href)
+            # Try to extract aircraft model from text or URL
+            aircraft_model = self._extract_aircraft_model(text, href)
+            if aircraft_model and full_url not in seen_urls:
+                seen_urls.add(full_url)
+                aircraft_links.append((aircraft_model, full_url))
         
         return aircraft_links
     
+    def _build_aircraft_automaton(self):
+        """Compile all aircraft keywords into one Aho-Corasick automaton.
+        
+        Each keyword maps to ``(model_rank, model)`` so the lowest rank among
+        all hits reproduces the config-order precedence of the substring scan.
+        Returns None when pyahocorasick is not installed.
+        """
+        if ahocorasick is None:
+            return None
+        automaton = ahocorasick.Automaton()
+        for key, hit in self._aircraft_kw_rank.items():
+            automaton.add_word(key, hit)
+        if len(automaton) == 0:
+            return None
+        automaton.make_automaton()
+        return automaton
+    
+    def _build_aircraft_regex(self) -> Optional[re.Pattern]:
+        """Compile all aircraft keywords into one alternation for the fallback scan.
+        
+        The alternation sits in a lookahead so ``finditer`` reports a hit at
+        every position, overlapping ones included; keywords are listed in rank
+        order so each position yields its lowest-rank keyword. Taking the
+        minimum rank over all hits then gives the same answer as the automaton.
+        """
+        if not self._aircraft_kw_rank:
+            return None
+        return re.compile('(?=(' + '|'.join(map(re.escape, self._aircraft_kw_rank)) + '))')
+    
     def _extract_aircraft_model(self, text: str, url: str = "") -> str:
         """Extract aircraft model from text or URL.
         
@@ -288,47 +509,82 @@ class AerolopaCrawler:
         combined_text = f"{text} {url}".upper()
         
         # Check against known aircraft keywords
-        for model, keywords in self.config.aircraft_keywords.items():
-            for keyword in keywords:
-                if keyword.upper() in combined_text:
-                    return model
+        if self._aircraft_ac is not None:
+            hits = (hit for _, hit in self._aircraft_ac.iter(combined_text))
+        elif self._aircraft_re is not None:
+            hits = (self._aircraft_kw_rank[m.group(1)] for m in self._aircraft_re.finditer(combined_text))
+        else:
+            hits = iter(())
+        best = min(hits, default=None)
+        if best is not None:
+            return best[1]
         
         # If no match found, return cleaned text
-        return re.sub(r'[^A-Z0-9]', '', text.upper()) or text
+        return _NON_ALNUM.sub('', text.upper()) or text
     
-    def _extract_seat_map_images(self, soup: BeautifulSoup, base_url: str) -> List[str]:
+    def _extract_seat_map_images(
+        self, html_bytes: bytes, base_url: str, charset: Optional[str] = None
+    ) -> List[str]:
         """Extract seat map image URLs from aircraft page.
         
+        Uses selectolax when enabled, otherwise walks ``lxml``'s
+        ``iterlinks()``; neither builds a BeautifulSoup tree.
+        
         Args:
-            soup: BeautifulSoup object of the aircraft page
+            html_bytes: Raw HTML of the aircraft page
             base_url: Base URL for resolving relative links
+            charset: Charset from the HTTP headers, if any
             
         Returns:
-            List of image URLs
+            List of image URLs in document order
         """
-        image_urls = []
-        
-        # Look for images in various patterns
-        img_selectors = [
-            'img[src*="seat"]',
-            'img[src*="map"]',
-            'img[alt*="seat"]',
-            'img[alt*="map"]',
-            '.seatmap img',
-            '.seat-map img',
-            '.aircraft-layout img'
-        ]
-        
-        for selector in img_selectors:
-            images = soup.select(selector)
-            for img in images:
-                src = img.get('src')
-                if src:
-                    full_url = urljoin(base_url, src)
-                    if self._is_valid_image_url(full_url):
-                        image_urls.append(full_url)
-        
-        return list(set(image_urls))  # Remove duplicates
+        if self._fast_parser:
+            tree = LexborHTMLParser(self._decode_html(html_bytes, charset))
+            sources = (node.attributes.get('src') for node in tree.css(_SEAT_MAP_IMG_SELECTOR))
+        else:
+            try:
+                # Undeclared pages are UTF-8 (see _fetch_html); without an
+                # explicit encoding lxml would fall back to Latin-1
+                parser = lxml.html.HTMLParser(encoding=charset or 'utf-8')
+                doc = lxml.html.document_fromstring(html_bytes, parser=parser)
+            except (ValueError, LookupError, lxml.etree.ParserError) as e:
+                self.logger.error(f"Error parsing {base_url}: {e}")
+                return []
+            sources = (
+                link for element, attribute, link, _ in doc.iterlinks()
+                if element.tag == 'img' and attribute == 'src' and self._is_seat_map_img(element, link)
+            )
+        
+        image_urls = {}
+        for src in sources:
+            if not src:
+                continue
+            full_url = urljoin(base_url, src)
+            if full_url not in image_urls and self._is_valid_image_url(full_url):
+                image_urls[full_url] = None
+        
+        return list(image_urls)
+    
+    @staticmethod
+    def _is_seat_map_img(element, src: str) -> bool:
+        """Check whether an ``<img>`` looks like a seat map."""
+        alt = element.get('alt') or ''
+        if any(hint in src or hint in alt for hint in _SEAT_MAP_IMG_HINTS):
+            return True
+        for ancestor in element.iterancestors():
+            classes = ancestor.get('class')
+            if classes and not _SEAT_MAP_CONTAINER_CLASSES.isdisjoint(classes.split()):
+                return True
+        return False
+    
+    @staticmethod
+    def _extract_page_title(html_bytes: bytes, charset: Optional[str] = None) -> str:
+        """Extract the ``<title>`` text without parsing the whole page."""
+        match = _TITLE_RE.search(html_bytes)
+        if not match:
+            return ''
+        title = AerolopaCrawler._decode_html(match.group(1), charset)
+        return html.unescape(title).strip()
     
     def _is_valid_image_url(self, url: str) -> bool:
         """Check if URL points to a valid image.
@@ -343,64 +599,107 @@ class AerolopaCrawler:
             return False
         
         # Check file extension
-        parsed = urlparse(url.lower())
-        path = parsed.path
-        
-        valid_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg']
-        if any(path.endswith(ext) for ext in valid_extensions):
+        url_lower = url.lower()
+        if urlparse(url_lower).path.endswith(_VALID_EXTS):
             return True
         
         # Check for image-related keywords in URL
-        image_keywords = ['seat', 'map', 'layout', 'cabin', 'aircraft']
-        return any(keyword in url.lower() for keyword in image_keywords)
+        return any(keyword in url_lower for keyword in _IMG_KEYWORDS)
     
+    def _accept_image_response(self, image_url: str, response: requests.Response) -> bool:
+        """根据 GET 响应头跳过非图片或声明大小超过上限的资源，不读取正文"""
+        content_type = response.headers.get('Content-Type', '')
+        if content_type and not content_type.startswith('image/'):
+            self.logger.debug(f"Skipping non-image {image_url} ({content_type})")
+            return False
+
+        max_bytes = self.config.image.max_bytes
+        try:
+            content_length = int(response.headers.get('Content-Length') or 0)
+        except ValueError:
+            content_length = 0
+        if max_bytes and content_length > max_bytes:
+            self.logger.debug(f"Skipping oversized image {image_url} ({content_length} bytes)")
+            return False
+
+        return True
+
     def _download_image(self, image_url: str, airline_iata: str, filename: str) -> Optional[str]:
         """下载图片并保存到对应航空公司文件夹"""
 
+        digest = hashlib.sha1(image_url.encode('utf-8')).hexdigest()
+        known_path = self.processed_images.get(digest)
+        if known_path and os.path.exists(known_path):
+            self.logger.debug(f"Image already downloaded: {image_url}")
+            return known_path
+
+        file_path = None
         try:
-            response = self.session.get(
+            # 响应头到达后即可判断类型和声明大小，无需额外的 HEAD 请求
+            self._limiter.acquire()
+            with self.session.get(
                 image_url,
                 timeout=self.config.crawler.timeout,
                 stream=True
-            )
-            response.raise_for_status()
+            ) as response:
+                response.raise_for_status()
+                if not self._accept_image_response(image_url, response):
+                    return None
+
+                airline_dir = self._cache_dir / airline_iata.upper()
+                airline_dir.mkdir(exist_ok=True)
+                file_path = str(airline_dir / filename)
 
-            airline_dir = os.path.join(self.config.image.cache_dir, airline_iata.upper())
-            os.makedirs(airline_dir, exist_ok=True)
-            file_path = os.path.join(airline_dir, filename)
+                # Content-Length 可能缺失或不实，按实际读取的字节数限制
+                max_bytes = self.config.image.max_bytes
+                written = 0
+                with open(file_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=8192):
+                        written += len(chunk)
+                        if max_bytes and written > max_bytes:
+                            break
+                        f.write(chunk)
 
-            with open(file_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    f.write(chunk)
+            if max_bytes and written > max_bytes:
+                os.remove(file_path)
+                self.logger.debug(f"Skipping oversized image {image_url} (over {max_bytes} bytes)")
+                return None
 
+            self._remember_image(digest, file_path)
             self.logger.debug(f"Downloaded image: {file_path}")
             return file_path
 
         except Exception as e:
             self.logger.error(f"Failed to download image {image_url}: {e}")
+            if file_path and os.path.exists(file_path):
+                os.remove(file_path)
             return None
     
-    def _generate_image_filename(self, airline_iata: str, aircraft_model: str, image_url: str) -> str:
+    def _generate_image_filename(
+        self, airline_iata: str, aircraft_model: str, image_url: str, timestamp: Optional[int] = None
+    ) -> str:
         """Generate a standardized filename for downloaded images.
         
         Args:
             airline_iata: IATA code of the airline
             aircraft_model: Aircraft model
             image_url: Original image URL
+            timestamp: Crawl start time; defaults to now
             
         Returns:
-            Standardized filename
+            Standardized filename, unique within this crawler instance
         """
         # Extract file extension
         parsed = urlparse(image_url)
         ext = os.path.splitext(parsed.path)[1] or '.jpg'
         
-        # Create filename
-        timestamp = int(time.time())
-        filename = f"{airline_iata}_{aircraft_model}_{timestamp}{ext}"
+        # Create filename; the counter keeps names from the same second apart
+        if timestamp is None:
+            timestamp = int(time.time())
+        filename = f"{airline_iata}_{aircraft_model}_{timestamp}_{next(self._filename_counter)}{ext}"
         
         # Clean filename
-        filename = re.sub(r'[^a-zA-Z0-9._-]', '_', filename)
+        filename = _NON_FILENAME.sub('_', filename)
         
         return filename
     
@@ -424,33 +723,50 @@ class AerolopaCrawler:
         # Construct airline URL (this may need adjustment based on actual site structure)
         airline_url = f"{self.config.crawler.base_url}/airline/{airline_iata.lower()}"
         
-        soup = self._fetch_page(airline_url)
-        if not soup:
+        fetched = self._fetch_html(airline_url)
+        if not fetched:
             self.logger.error(f"Failed to fetch airline page: {airline_url}")
             return 0
         
         # Extract aircraft links
-        aircraft_links = self._extract_aircraft_links(soup, airline_url)
+        aircraft_links = self._extract_aircraft_links(fetched[0], airline_url, fetched[1])
         
+        crawl_ts = int(time.time())
         processed_count = 0
         for aircraft_model, aircraft_url in aircraft_links:
-            if aircraft_url in self.processed_urls:
+            if not self._claim_url(aircraft_url):
                 continue
             
             self.logger.info(f"Processing {aircraft_model}: {aircraft_url}")
             
             # Fetch aircraft page
-            aircraft_soup = self._fetch_page(aircraft_url)
-            if not aircraft_soup:
+            fetched = self._fetch_html(aircraft_url)
+            if not fetched:
+                self._release_url(aircraft_url)
                 continue
+            html_bytes, charset = fetched
             
             # Extract seat map images
-            image_urls = self._extract_seat_map_images(aircraft_soup, aircraft_url)
+            image_urls = self._extract_seat_map_images(html_bytes, aircraft_url, charset)
+            
+            # Computed once per page rather than once per image
+            crawl_time_str = time.strftime('%Y-%m-%d %H:%M:%S')
+            page_title = self._extract_page_title(html_bytes, charset)
+            
+            # Download all images of this page concurrently
+            futures = {
+                self._download_pool.submit(
+                    self._download_image,
+                    image_url,
+                    iata_code,
+                    self._generate_image_filename(iata_code, aircraft_model, image_url, crawl_ts),
+                ): image_url
+                for image_url in image_urls
+            }
             
-            for image_url in image_urls:
-                # Generate filename and download image
-                filename = self._generate_image_filename(iata_code, aircraft_model, image_url)
-                image_path = self._download_image(image_url, iata_code, filename)
+            for future in as_completed(futures):
+                image_url = futures[future]
+                image_path = future.result()
                 
                 # Prepare data for DB
                 data = {
@@ -461,8 +777,8 @@ class AerolopaCrawler:
                     'seat_map_url': aircraft_url,
                     'image_url': image_url,
                     'image_path': image_path or '',
-                    'crawl_time': time.strftime('%Y-%m-%d %H:%M:%S'),
-                    'page_title': aircraft_soup.title.string if aircraft_soup.title else '',
+                    'crawl_time': crawl_time_str,
+                    'page_title': page_title,
                     'description': ''
                 }
                 
@@ -471,40 +787,49 @@ class AerolopaCrawler:
                 processed_count += 1
                 
                 self.logger.info(f"Processed seat map: {aircraft_model} - {image_url}")
-            
-            self.processed_urls.add(aircraft_url)
-            
-            # Respect crawl delay
-            time.sleep(self.config.crawler.delay)
         
+        self.flush()
         self.logger.info(f"Completed crawling {chinese_name}: {processed_count} seat maps processed")
         return processed_count
     
     def crawl_all_airlines(self) -> int:
         """Crawl seat maps for all supported airlines.
         
+        Airlines are crawled concurrently by at most
+        ``config.crawler.max_workers`` worker threads; the shared rate
+        limiter keeps the aggregate request rate under ``config.crawler.rps``
+        (one request per ``config.crawler.delay`` seconds when unset).
+        
         Returns:
             Total number of seat maps processed
         """
         supported_airlines = self.airline_manager.get_supported_iata_codes()
+        max_workers = max(1, self.config.crawler.max_workers)
         total_processed = 0
         
-        self.logger.info(f"Starting crawl for {len(supported_airlines)} airlines")
+        self.logger.info(
+            f"Starting crawl for {len(supported_airlines)} airlines "
+            f"with {max_workers} workers"
+        )
         
-        for airline_iata in supported_airlines:
-            try:
-                count = self.crawl_airline_seatmaps(airline_iata)
-                total_processed += count
-                
-                # Longer delay between airlines
-                time.sleep(self.config.crawler.delay * 2)
-                
-            except KeyboardInterrupt:
-                self.logger.info("Crawl interrupted by user")
-                break
-            except Exception as e:
-                self.logger.error(f"Error crawling airline {airline_iata}: {e}")
-                continue
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = {
+            executor.submit(self.crawl_airline_seatmaps, airline_iata): airline_iata
+            for airline_iata in supported_airlines
+        }
+        try:
+            for future in as_completed(futures):
+                airline_iata = futures[future]
+                try:
+                    total_processed += future.result()
+                except Exception as e:
+                    self.logger.error(f"Error crawling airline {airline_iata}: {e}")
+        except KeyboardInterrupt:
+            self.logger.info("Crawl interrupted by user")
+            for future in futures:
+                future.cancel()
+        finally:
+            executor.shutdown(wait=True)
         
         self.logger.info(f"Crawl completed: {total_processed} total seat maps processed")
         return total_processed
@@ -515,24 +840,8 @@ class AerolopaCrawler:
         Returns:
             Dictionary with crawl statistics
         """
-        stats = {
+        return {
             'total_airlines': len(self.airline_manager.get_supported_iata_codes()),
             'processed_urls': len(self.processed_urls),
-            'db_records': 0
+            'db_records': self._db_rows
         }
-        
-        # Count DB records
-        if os.path.exists(getattr(self, 'db_file', '')):
-            try:
-                conn = sqlite3.connect(self.db_file)
-                try:
-                    cur = conn.cursor()
-                    cur.execute("SELECT COUNT(*) FROM seatmaps")
-                    row = cur.fetchone()
-                    stats['db_records'] = int(row[0]) if row else 0
-                finally:
-                    conn.close()
-            except Exception:
-                stats['db_records'] = 0
-        
-        return stats
\ No newline at end of file
@@ -5,6 +5,7 @@ Chinese and English names, and utility functions.
 """
 from __future__ import annotations
 
+import sys
 from typing import Dict, List, Optional, Tuple
 
 
@@ -166,6 +167,19 @@ AIRLINES: Dict[str, Tuple[str, str]] = {
     "ZH": ("深圳航空", "Shenzhen Airlines"),
 }
 
+# Intern IATA codes so lookups and comparisons hit the identity fast path
+AIRLINES = {sys.intern(iata_code): names for iata_code, names in AIRLINES.items()}
+
+
+# Managers usually share the module-level AIRLINES dict, so their cached
+# indexes are versioned globally: any mutation invalidates every instance.
+_data_version = 0
+
+
+def _bump_data_version() -> None:
+    global _data_version
+    _data_version += 1
+
 
 class AirlineManager:
     """Manager for airline information and operations."""
@@ -178,6 +192,24 @@ class AirlineManager:
                           If None, uses the default AIRLINES data.
         """
         self._airlines = airlines_data or AIRLINES
+        self._lower_index: List[Tuple[str, str, str, str, str]] = []
+        self._sorted_codes: Tuple[str, ...] = ()
+        self._index_version = -1
+        self._rebuild_index()
+    
+    def _rebuild_index(self) -> None:
+        """Precompute sorted codes and the lower-cased names used by :meth:`search_by_name`."""
+        self._index_version = _data_version
+        self._sorted_codes = tuple(sorted(self._airlines))
+        self._lower_index = [
+            (iata_code, chinese_name, english_name, chinese_name.lower(), english_name.lower())
+            for iata_code, (chinese_name, english_name) in self._airlines.items()
+        ]
+    
+    def _refresh_index(self) -> None:
+        """Rebuild the cached indexes if any manager has mutated airline data since."""
+        if self._index_version != _data_version:
+            self._rebuild_index()
     
     def get_airline_info(self, iata_code: str) -> Optional[Tuple[str, str, str]]:
         """Get airline information by IATA code.
@@ -217,7 +249,8 @@ class AirlineManager:
     
     def get_supported_iata_codes(self) -> List[str]:
         """Get list of all supported IATA codes."""
-        return sorted(self._airlines.keys())
+        self._refresh_index()
+        return list(self._sorted_codes)
     
     def is_supported(self, iata_code: str) -> bool:
         """Check if an IATA code is supported."""
@@ -234,28 +267,22 @@ class AirlineManager:
             List of matching airlines as (IATA code, Chinese name, English name) tuples
         """
         name = name.lower().strip()
+        search_chinese = language in ('chinese', 'both')
+        search_english = language in ('english', 'both')
         results = []
+        self._refresh_index()
         
-        for iata_code, (chinese_name, english_name) in self._airlines.items():
-            match = False
-            
-            if language in ('chinese', 'both'):
-                if name in chinese_name.lower():
-                    match = True
-            
-            if language in ('english', 'both'):
-                if name in english_name.lower():
-                    match = True
-            
-            if match:
+        for iata_code, chinese_name, english_name, chinese_lower, english_lower in self._lower_index:
+            if (search_chinese and name in chinese_lower) or (search_english and name in english_lower):
                 results.append((iata_code, chinese_name, english_name))
         
         return results
     
     def add_airline(self, iata_code: str, chinese_name: str, english_name: str) -> None:
         """Add a new airline to the configuration."""
-        iata_code = iata_code.upper().strip()
+        iata_code = sys.intern(iata_code.upper().strip())
         self._airlines[iata_code] = (chinese_name.strip(), english_name.strip())
+        _bump_data_version()
     
     def remove_airline(self, iata_code: str) -> bool:
         """Remove an airline from the configuration.
@@ -266,6 +293,7 @@ class AirlineManager:
         iata_code = iata_code.upper().strip()
         if iata_code in self._airlines:
             del self._airlines[iata_code]
+            _bump_data_version()
             return True
         return False
     
@@ -13,16 +13,20 @@ from .validators import (
     validate_image_params
 )
 from .utils import (
+    iso_timestamp,
+    json_dumps,
     standardize_aircraft_model,
     generate_cache_key,
     optimize_image,
     get_cached_image,
     save_cached_image,
+    save_cached_image_async,
     check_local_seatmap_cache,
     filter_aircraft_images,
     is_aircraft_match,
     calculate_cache_stats,
     calculate_data_stats,
+    calculate_directory_stats,
     clear_cache_directory
 )
 from .decorators import (
@@ -31,6 +35,7 @@ from .decorators import (
     log_request,
     cache_response,
     require_json,
+    get_json_body,
     validate_content_length
 )
 from .routes import api_bp, main_bp
@@ -53,16 +58,20 @@ __all__ = [
     'validate_image_params',
     
     # 工具函数
+    'iso_timestamp',
+    'json_dumps',
     'standardize_aircraft_model',
     'generate_cache_key',
     'optimize_image',
     'get_cached_image',
     'save_cached_image',
+    'save_cached_image_async',
     'check_local_seatmap_cache',
     'filter_aircraft_images',
     'is_aircraft_match',
     'calculate_cache_stats',
     'calculate_data_stats',
+    'calculate_directory_stats',
     'clear_cache_directory',
     
     # 装饰器
@@ -71,6 +80,7 @@ __all__ = [
     'log_request',
     'cache_response',
     'require_json',
+    'get_json_body',
     'validate_content_length',
     
     # 蓝图
@@ -4,17 +4,90 @@
 """
 
 import os
+import atexit
+import queue
 import logging
 from datetime import datetime
-from typing import Optional
+from functools import partial
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Callable, Dict, Optional, Tuple
 
-from flask import Flask, jsonify
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from flask_caching import Cache
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    # 可选依赖；未安装时使用Flask默认的JSON序列化
+    orjson = None
+
 from ..config import Config
 from .routes import api_bp, main_bp
+from .decorators import check_content_length
 from .exceptions import APIError
+from .utils import iso_timestamp, json_dumps
+
+
+# 全局错误处理器：HTTP状态码 -> (错误代码, 错误消息)
+_HTTP_ERRORS = {
+    400: ("BAD_REQUEST", "请求格式错误"),
+    401: ("UNAUTHORIZED", "未授权访问"),
+    403: ("FORBIDDEN", "禁止访问"),
+    404: ("NOT_FOUND", "资源不存在"),
+    405: ("METHOD_NOT_ALLOWED", "请求方法不允许"),
+    413: ("PAYLOAD_TOO_LARGE", "请求体过大"),
+    429: ("TOO_MANY_REQUESTS", "请求频率超限"),
+    500: ("INTERNAL_SERVER_ERROR", "服务器内部错误"),
+    502: ("BAD_GATEWAY", "网关错误"),
+    503: ("SERVICE_UNAVAILABLE", "服务不可用"),
+    504: ("GATEWAY_TIMEOUT", "网关超时"),
+}
+
+# 预先序列化的错误响应体，仅在返回时替换时间戳
+_TIMESTAMP_PLACEHOLDER = b'"__TIMESTAMP__"'
+_ERROR_TEMPLATES = {
+    status: json_dumps(
+        {
+            "success": False,
+            "error": {"code": code, "message": message},
+            "timestamp": "__TIMESTAMP__",
+        }
+    )
+    for status, (code, message) in _HTTP_ERRORS.items()
+}
+
+# 状态码 -> 最近一次生成的 (时间戳, 响应体)
+_error_bodies: Dict[int, Tuple[str, bytes]] = {}
+
+
+class _OrjsonProvider(DefaultJSONProvider):
+    """使用 orjson 的 JSON 提供器，jsonify 直接得到 UTF-8 字节串
+
+    与 JSON_AS_ASCII/JSON_SORT_KEYS 配置一致：不转义非ASCII字符、不排序键；
+    日期时间仍交给 Flask 的 default 处理，保持原有的 HTTP 日期格式。
+    """
+
+    ensure_ascii = False
+    sort_keys = False
+
+    def _dumps_bytes(self, obj) -> bytes:
+        return orjson.dumps(
+            obj,
+            default=self.default,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+        )
+
+    def dumps(self, obj, **kwargs) -> str:
+        return self._dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps_bytes(obj), mimetype=self.mimetype)
 
 
 def create_app(config: Optional[Config] = None) -> Flask:
@@ -27,6 +100,8 @@ def create_app(config: Optional[Config] = None) -> Flask:
         配置好的Flask应用实例
     """
     app = Flask(__name__)
+    if orjson is not None:
+        app.json = _OrjsonProvider(app)
 
     # 使用配置
     if config is None:
@@ -39,7 +114,8 @@ def create_app(config: Optional[Config] = None) -> Flask:
             "JSON_AS_ASCII": False,
             "JSON_SORT_KEYS": False,
             "JSONIFY_PRETTYPRINT_REGULAR": True,
-            "MAX_CONTENT_LENGTH": 16 * 1024 * 1024,  # 16MB
+            # 全局请求体上限，超出时由Werkzeug直接返回413
+            "MAX_CONTENT_LENGTH": config.api.max_content_length,
             "CACHE_TYPE": "simple",
             "CACHE_DEFAULT_TIMEOUT": 300,
         }
@@ -76,6 +152,8 @@ def _init_extensions(app: Flask) -> None:
                 "origins": ["*"],
                 "methods": ["GET", "POST", "OPTIONS"],
                 "allow_headers": ["Content-Type", "Authorization"],
+                # 浏览器缓存预检结果一天，减少 OPTIONS 请求
+                "max_age": 86400,
             }
         },
     )
@@ -84,6 +162,9 @@ def _init_extensions(app: Flask) -> None:
     cache = Cache()
     cache.init_app(app)
 
+    # 按路由的请求体大小限制（validate_content_length）
+    app.before_request(check_content_length)
+
 
 def _register_blueprints(app: Flask) -> None:
     """注册蓝图"""
@@ -97,167 +178,66 @@ def _register_blueprints(app: Flask) -> None:
 def _register_error_handlers(app: Flask) -> None:
     """注册全局错误处理器"""
 
-    @app.errorhandler(400)
-    def bad_request(error):
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error": {"code": "BAD_REQUEST", "message": "请求格式错误"},
-                    "timestamp": datetime.now().isoformat(),
-                }
-            ),
-            400,
-        )
-
-    @app.errorhandler(401)
-    def unauthorized(error):
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error": {"code": "UNAUTHORIZED", "message": "未授权访问"},
-                    "timestamp": datetime.now().isoformat(),
-                }
-            ),
-            401,
-        )
+    for status in _ERROR_TEMPLATES:
+        app.register_error_handler(status, partial(_error_response, status))
 
-    @app.errorhandler(403)
-    def forbidden(error):
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error": {"code": "FORBIDDEN", "message": "禁止访问"},
-                    "timestamp": datetime.now().isoformat(),
-                }
-            ),
-            403,
+    @app.errorhandler(APIError)
+    def handle_api_error(error: APIError):
+        return Response(
+            error.to_json_bytes(),
+            status=error.status_code,
+            headers=error.headers,
+            mimetype="application/json",
         )
 
-    @app.errorhandler(404)
-    def not_found(error):
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error": {"code": "NOT_FOUND", "message": "资源不存在"},
-                    "timestamp": datetime.now().isoformat(),
-                }
-            ),
-            404,
-        )
 
-    @app.errorhandler(405)
-    def method_not_allowed(error):
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error": {
-                        "code": "METHOD_NOT_ALLOWED",
-                        "message": "请求方法不允许",
-                    },
-                    "timestamp": datetime.now().isoformat(),
-                }
-            ),
-            405,
-        )
+def _error_response(status: int, error) -> Response:
+    """使用预先序列化的模板构造错误响应
 
-    @app.errorhandler(413)
-    def payload_too_large(error):
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error": {"code": "PAYLOAD_TOO_LARGE", "message": "请求体过大"},
-                    "timestamp": datetime.now().isoformat(),
-                }
-            ),
-            413,
+    时间戳精确到秒，同一秒内同一状态码的重复错误（如爬虫扫描不存在的
+    路径）直接复用已生成的响应体。
+    """
+    timestamp = iso_timestamp()
+    cached = _error_bodies.get(status)
+    if cached is None or cached[0] != timestamp:
+        body = _ERROR_TEMPLATES[status].replace(
+            _TIMESTAMP_PLACEHOLDER, json_dumps(timestamp)
         )
+        cached = _error_bodies[status] = (timestamp, body)
+    return Response(cached[1], status=status, mimetype="application/json")
 
-    @app.errorhandler(429)
-    def too_many_requests(error):
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error": {"code": "TOO_MANY_REQUESTS", "message": "请求频率超限"},
-                    "timestamp": datetime.now().isoformat(),
-                }
-            ),
-            429,
-        )
 
-    @app.errorhandler(500)
-    def internal_server_error(error):
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error": {
-                        "code": "INTERNAL_SERVER_ERROR",
-                        "message": "服务器内部错误",
-                    },
-                    "timestamp": datetime.now().isoformat(),
-                }
-            ),
-            500,
-        )
+class _JSONFormatter(logging.Formatter):
+    """JSON行日志格式，log_request 附带的结构化字段（`fields`）直接并入记录"""
 
-    @app.errorhandler(502)
-    def bad_gateway(error):
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error": {"code": "BAD_GATEWAY", "message": "网关错误"},
-                    "timestamp": datetime.now().isoformat(),
-                }
-            ),
-            502,
-        )
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        fields = getattr(record, "fields", None)
+        if fields:
+            entry.update(fields)
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json_dumps(entry).decode("utf-8")
 
-    @app.errorhandler(503)
-    def service_unavailable(error):
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error": {"code": "SERVICE_UNAVAILABLE", "message": "服务不可用"},
-                    "timestamp": datetime.now().isoformat(),
-                }
-            ),
-            503,
-        )
 
-    @app.errorhandler(504)
-    def gateway_timeout(error):
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error": {"code": "GATEWAY_TIMEOUT", "message": "网关超时"},
-                    "timestamp": datetime.now().isoformat(),
-                }
-            ),
-            504,
-        )
+def _start_log_listener(
+    queue_handler: QueueHandler, handlers: Tuple[logging.Handler, ...]
+) -> None:
+    """为队列日志处理器启动后台写入线程
 
-    @app.errorhandler(APIError)
-    def handle_api_error(error: APIError):
-        return (
-            jsonify(
-                {
-                    "success": False,
-                    "error": error.to_dict(),
-                    "timestamp": datetime.now().isoformat(),
-                }
-            ),
-            error.status_code,
-        )
+    每次调用都换用新队列，fork 后子进程不会继承父进程队列中残留的记录。
+    """
+    queue_handler.queue = queue.Queue(-1)
+    listener = QueueListener(
+        queue_handler.queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
 
 
 def _configure_logging(app: Flask, config: Config) -> None:
@@ -273,12 +253,39 @@ def _configure_logging(app: Flask, config: Config) -> None:
             logs_dir, "aerolopa_api.log"
         )
 
-        # 生产环境日志配置
-        logging.basicConfig(
-            level=getattr(logging, config.logging.level.upper()),
-            format=config.logging.format,
-            handlers=[logging.StreamHandler(), logging.FileHandler(log_file)],
-        )
+        # 生产环境日志配置：请求线程只把日志放入队列，
+        # 由后台线程统一写入控制台和文件
+        if not logging.getLogger().handlers:
+            if config.logging.json:
+                formatter = _JSONFormatter()
+            else:
+                formatter = logging.Formatter(config.logging.format)
+            stream_handler = logging.StreamHandler()
+            file_handler = RotatingFileHandler(
+                log_file,
+                maxBytes=config.logging.max_bytes,
+                backupCount=config.logging.backup_count,
+                encoding="utf-8",
+                delay=True,
+            )
+            stream_handler.setFormatter(formatter)
+            file_handler.setFormatter(formatter)
+
+            # 完整格式由监听线程中的处理器负责
+            queue_handler = QueueHandler(queue.Queue(-1))
+            queue_handler.setFormatter(logging.Formatter("%(message)s"))
+            handlers = (stream_handler, file_handler)
+            _start_log_listener(queue_handler, handlers)
+            logging.basicConfig(
+                level=getattr(logging, config.logging.level.upper()),
+                handlers=[queue_handler],
+            )
+
+            # 监听线程不会随 fork 复制（如 gunicorn preload），在子进程中重新启动
+            if hasattr(os, "register_at_fork"):
+                os.register_at_fork(
+                    after_in_child=partial(_start_log_listener, queue_handler, handlers)
+                )
 
     # 设置Flask日志级别
     app.logger.setLevel(getattr(logging, config.logging.level.upper()))
@@ -302,16 +309,77 @@ def _ensure_directories(config: Config) -> None:
             os.makedirs(directory, exist_ok=True)
 
 
+def _serve_production(app_factory: Callable[[], Flask], host: str, port: int) -> bool:
+    """使用生产级WSGI服务器运行应用
+
+    Linux/macOS 优先使用多进程的 gunicorn（安装了 gevent 时使用协程
+    worker），否则使用 waitress。应用由 `app_factory` 创建：gevent worker
+    在 fork 之后才 monkey patch，master 中提前导入的 requests/urllib3/ssl
+    不会被正确替换，因此该模式下不预加载，由每个 worker 自行创建应用。
+
+    Returns:
+        两者均未安装时返回False
+    """
+    cpu_count = os.cpu_count() or 1
+    workers = cpu_count * 2 + 1
+
+    if os.name != "nt":
+        try:
+            from gunicorn.app.base import BaseApplication
+        except ImportError:
+            pass
+        else:
+            # 默认在 master 中创建 app，worker fork 后通过写时复制共享
+            options = {
+                "bind": f"{host}:{port}",
+                "workers": workers,
+                "timeout": 120,
+                "preload_app": True,
+            }
+            try:
+                import gevent  # noqa: F401
+            except ImportError:
+                pass
+            else:
+                # 协程worker在I/O等待时可同时处理大量连接，由gunicorn负责monkey patch
+                options.update(
+                    worker_class="gevent",
+                    workers=cpu_count,
+                    worker_connections=1000,
+                    keepalive=5,
+                    preload_app=False,
+                )
+
+            class _GunicornApp(BaseApplication):
+                def load_config(self):
+                    for key, value in options.items():
+                        self.cfg.set(key, value)
+
+                def load(self):
+                    return app_factory()
+
+            _GunicornApp().run()
+            return True
+
+    try:
+        from waitress import serve
+    except ImportError:
+        return False
+
+    serve(app_factory(), host=host, port=port, threads=workers)
+    return True
+
+
 def run_app(host: str = "0.0.0.0", port: int = 5000, debug: bool = False) -> None:
     """运行Flask应用
 
+    非调试模式下使用 gunicorn/waitress；Flask 内置服务器仅用于调试。
+
     Args:
         host: 主机地址
         port: 端口号
         debug: 是否开启调试模式
     """
-    app = create_app()
-
     print("\n🚀 AeroLOPA API服务启动")
     print(f"📍 地址: http://{host}:{port}")
     print(f"📚 文档: http://{host}:{port}/docs")
@@ -321,7 +389,9 @@ def run_app(host: str = "0.0.0.0", port: int = 5000, debug: bool = False) -> Non
     print("\n按 Ctrl+C 停止服务\n")
 
     try:
-        app.run(host=host, port=port, debug=debug, threaded=True)
+        if debug or not _serve_production(create_app, host, port):
+            # 内置开发服务器，仅用于调试或未安装生产服务器时
+            create_app().run(host=host, port=port, debug=debug, threaded=True)
     except KeyboardInterrupt:
         print("\n👋 AeroLOPA API服务已停止")
     except Exception as e:
@@ -5,22 +5,36 @@
 
 import time
 import uuid
+import hashlib
 import logging
-from datetime import datetime
 from functools import wraps
-from collections import defaultdict, deque
 from typing import Callable
 
-from flask import request, jsonify, g
+from flask import Response, current_app, g, jsonify, make_response, request
+from werkzeug.exceptions import HTTPException
 
 from .exceptions import APIError
+from .ratelimit import get_rate_limiter
+from .utils import iso_timestamp, json_loads
 
 
 # 全局变量
-request_counts = defaultdict(deque)  # 存储每个IP的请求时间戳
 logger = logging.getLogger(__name__)
 
 
+def get_client_ip() -> str:
+    """获取客户端IP，每个请求只解析一次并缓存在g对象中
+    
+    存在 X-Forwarded-For 时取其中第一个地址。
+    """
+    client_ip = g.get('client_ip')
+    if client_ip is None:
+        forwarded = request.environ.get('HTTP_X_FORWARDED_FOR', '')
+        client_ip = forwarded.split(',', 1)[0].strip() or request.remote_addr or 'unknown'
+        g.client_ip = client_ip
+    return client_ip
+
+
 def error_handler(f: Callable) -> Callable:
     """统一错误处理装饰器
     
@@ -31,11 +45,15 @@ def error_handler(f: Callable) -> Callable:
         try:
             return f(*args, **kwargs)
         except APIError as e:
-            return jsonify({
-                'success': False,
-                'error': e.to_dict(),
-                'timestamp': datetime.now().isoformat()
-            }), e.status_code
+            return Response(
+                e.to_json_bytes(),
+                status=e.status_code,
+                headers=e.headers,
+                mimetype='application/json'
+            )
+        except HTTPException:
+            # 交给应用级错误处理器（如 MAX_CONTENT_LENGTH 触发的413）
+            raise
         except Exception as e:
             # 生成错误ID用于追踪
             error_id = str(uuid.uuid4())[:8]
@@ -48,7 +66,7 @@ def error_handler(f: Callable) -> Callable:
                     'message': '服务器内部错误',
                     'error_id': error_id
                 },
-                'timestamp': datetime.now().isoformat()
+                'timestamp': iso_timestamp()
             }), 500
     
     return decorated_function
@@ -57,6 +75,8 @@ def error_handler(f: Callable) -> Callable:
 def rate_limit(max_requests: int = 50, window_seconds: int = 3600) -> Callable:
     """请求频率限制装饰器
     
+    使用滑动窗口计数；配置 REDIS_URL 时限额在所有worker之间共享。
+    
     Args:
         max_requests: 时间窗口内最大请求数
         window_seconds: 时间窗口大小（秒）
@@ -65,28 +85,24 @@ def rate_limit(max_requests: int = 50, window_seconds: int = 3600) -> Callable:
         @wraps(f)
         def decorated_function(*args, **kwargs):
             # 获取客户端IP
-            client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.remote_addr)
-            if not client_ip:
-                client_ip = 'unknown'
-            
-            current_time = time.time()
+            client_ip = get_client_ip()
             
-            # 清理过期的请求记录
-            cutoff_time = current_time - window_seconds
-            while request_counts[client_ip] and request_counts[client_ip][0] < cutoff_time:
-                request_counts[client_ip].popleft()
-            
-            # 检查是否超过限制
-            if len(request_counts[client_ip]) >= max_requests:
+            # 检查是否超过限制，并记录当前请求
+            allowed, retry_after = get_rate_limiter().hit(client_ip, max_requests, window_seconds)
+            if not allowed:
                 raise APIError(
                     f"请求频率超限，每{window_seconds//60}分钟最多{max_requests}次请求",
                     429,
-                    "TOO_MANY_REQUESTS"
+                    "TOO_MANY_REQUESTS",
+                    {'retry_after': retry_after},
+                    headers={
+                        'Retry-After': str(retry_after),
+                        'RateLimit-Limit': str(max_requests),
+                        'RateLimit-Remaining': '0',
+                        'RateLimit-Reset': str(retry_after),
+                    }
                 )
             
-            # 记录当前请求
-            request_counts[client_ip].append(current_time)
-            
             return f(*args, **kwargs)
         
         return decorated_function
@@ -104,14 +120,14 @@ def log_request(f: Callable) -> Callable:
         start_time = time.time()
         
         # 获取请求信息
-        client_ip = request.environ.get('HTTP_X_FORWARDED_FOR', request.remote_addr)
+        client_ip = get_client_ip()
         user_agent = request.headers.get('User-Agent', 'Unknown')
         endpoint = request.endpoint or 'unknown'
         method = request.method
+        path = request.path
         
         # 存储到g对象中，供其他地方使用
         g.request_start_time = start_time
-        g.client_ip = client_ip
         g.user_agent = user_agent
         g.endpoint = endpoint
         
@@ -124,7 +140,11 @@ def log_request(f: Callable) -> Callable:
             
             # 记录成功请求
             logger.info(
-                f"{method} {request.path} - {client_ip} - {response_time:.3f}s - Success"
+                "%s %s - %s - %.3fs - Success", method, path, client_ip, response_time,
+                extra={'fields': {
+                    'method': method, 'path': path, 'ip': client_ip,
+                    'ms': round(response_time * 1000, 3), 'ok': True
+                }}
             )
             
             # 更新性能指标（如果有的话）
@@ -140,7 +160,11 @@ def log_request(f: Callable) -> Callable:
             # 记录失败请求
             error_type = type(e).__name__
             logger.error(
-                f"{method} {request.path} - {client_ip} - {response_time:.3f}s - Error: {error_type}"
+                "%s %s - %s - %.3fs - Error: %s", method, path, client_ip, response_time, error_type,
+                extra={'fields': {
+                    'method': method, 'path': path, 'ip': client_ip,
+                    'ms': round(response_time * 1000, 3), 'ok': False, 'error': error_type
+                }}
             )
             
             # 更新性能指标（如果有的话）
@@ -168,10 +192,32 @@ def _update_performance_metrics(endpoint: str, response_time: float, success: bo
         logger.debug(f"Performance: {endpoint} - {response_time:.3f}s - Error: {error_type}")
 
 
+def get_json_body():
+    """获取已解析的JSON请求体
+    
+    请求体每个请求只解析一次并缓存在 g.json 中；非JSON请求返回None。
+    
+    Raises:
+        APIError: JSON格式无效时
+    """
+    if 'json' not in g:
+        g.json = None
+        if request.is_json:
+            try:
+                g.json = json_loads(request.get_data(cache=True))
+            except ValueError:
+                raise APIError(
+                    "无效的JSON格式",
+                    400,
+                    "INVALID_JSON"
+                )
+    return g.json
+
+
 def require_json(f: Callable) -> Callable:
     """要求JSON请求体的装饰器
     
-    确保POST/PUT请求包含有效的JSON数据。
+    确保POST/PUT请求包含有效的JSON数据，解析结果可通过 get_json_body() 获取。
     """
     @wraps(f)
     def decorated_function(*args, **kwargs):
@@ -183,23 +229,30 @@ def require_json(f: Callable) -> Callable:
                     "INVALID_CONTENT_TYPE"
                 )
             
-            try:
-                request.get_json(force=True)
-            except Exception:
-                raise APIError(
-                    "无效的JSON格式",
-                    400,
-                    "INVALID_JSON"
-                )
+            get_json_body()
         
         return f(*args, **kwargs)
     
     return decorated_function
 
 
+def _get_cache():
+    """获取当前应用的缓存后端
+
+    Flask-Caching 在 app.extensions['cache'] 中保存 {Cache实例: 后端} 的映射。
+    """
+    cache = current_app.extensions.get('cache')
+    if isinstance(cache, dict):
+        return next(iter(cache.values()), None)
+    return cache
+
+
 def cache_response(timeout: int = 300) -> Callable:
     """响应缓存装饰器
     
+    缓存序列化后的响应体、响应头和ETag；客户端携带匹配的
+    If-None-Match 时直接返回304。
+    
     Args:
         timeout: 缓存超时时间（秒）
     """
@@ -207,53 +260,69 @@ def cache_response(timeout: int = 300) -> Callable:
         @wraps(f)
         def decorated_function(*args, **kwargs):
             # 生成缓存键
-            cache_key = f"{request.endpoint}:{request.full_path}"
+            # 直接拼接原始查询串，避免 full_path 重新编码
+            cache_key = f"{request.endpoint}:{request.path}?{request.query_string.decode('latin-1')}"
+            cache = _get_cache()
             
-            try:
-                from flask import current_app
-                cache = current_app.extensions.get('cache')
+            cached = None
+            if cache:
+                try:
+                    cached = cache.get(cache_key)
+                except Exception as e:
+                    logger.warning(f"Cache operation failed: {str(e)}")
+            
+            if cached is None:
+                response = make_response(f(*args, **kwargs))
+                # 仅缓存完整的成功响应
+                if response.status_code != 200 or response.is_streamed:
+                    return response
+                
+                body = response.get_data()
+                etag = hashlib.blake2b(body, digest_size=16).hexdigest()
+                response.set_etag(etag)
+                cached = (body, response.headers.to_wsgi_list(), response.status_code, etag)
                 
                 if cache:
-                    # 尝试从缓存获取
-                    cached_result = cache.get(cache_key)
-                    if cached_result is not None:
-                        return cached_result
-                    
-                    # 执行函数并缓存结果
-                    result = f(*args, **kwargs)
-                    cache.set(cache_key, result, timeout=timeout)
-                    return result
-                else:
-                    # 如果没有缓存系统，直接执行
-                    return f(*args, **kwargs)
-                    
-            except Exception as e:
-                logger.warning(f"Cache operation failed: {str(e)}")
-                # 缓存失败时直接执行原函数
-                return f(*args, **kwargs)
+                    try:
+                        cache.set(cache_key, cached, timeout=timeout)
+                    except Exception as e:
+                        logger.warning(f"Cache operation failed: {str(e)}")
+            
+            body, headers, status, etag = cached
+            if request.if_none_match.contains(etag):
+                return Response(status=304, headers={'ETag': f'"{etag}"'})
+            return Response(body, status=status, headers=headers)
         
         return decorated_function
     return decorator
 
 
 def validate_content_length(max_length: int = 1024 * 1024) -> Callable:
-    """验证请求内容长度的装饰器
+    """限制请求内容长度的装饰器
+    
+    不再包装视图函数，只在其上记录限制，由 check_content_length 钩子在
+    进入视图前检查；全局上限由 MAX_CONTENT_LENGTH 直接在 Werkzeug 中处理。
     
     Args:
         max_length: 最大内容长度（字节）
     """
     def decorator(f: Callable) -> Callable:
-        @wraps(f)
-        def decorated_function(*args, **kwargs):
-            content_length = request.content_length
-            if content_length and content_length > max_length:
-                raise APIError(
-                    f"请求体过大，最大允许 {max_length // 1024} KB",
-                    413,
-                    "PAYLOAD_TOO_LARGE"
-                )
-            
-            return f(*args, **kwargs)
-        
-        return decorated_function
-    return decorator
\ No newline at end of file
+        f.max_content_length = max_length
+        return f
+    return decorator
+
+
+def check_content_length() -> None:
+    """before_request 钩子：按视图上记录的限制拒绝过大的请求体"""
+    view = current_app.view_functions.get(request.endpoint)
+    max_length = getattr(view, 'max_content_length', None)
+    if max_length is None:
+        return
+    
+    content_length = request.content_length
+    if content_length and content_length > max_length:
+        raise APIError(
+            f"请求体过大，最大允许 {max_length // 1024} KB",
+            413,
+            "PAYLOAD_TOO_LARGE"
+        )
@@ -5,6 +5,8 @@
 
 from typing import Optional, Dict, Any
 
+from .utils import iso_timestamp, json_dumps
+
 
 class APIError(Exception):
     """API自定义异常类
@@ -12,7 +14,8 @@ class APIError(Exception):
     用于统一处理API错误，包含错误消息、HTTP状态码和错误代码。
     """
     
-    def __init__(self, message: str, status_code: int = 400, error_code: str = "API_ERROR", details: Optional[Dict[str, Any]] = None):
+    def __init__(self, message: str, status_code: int = 400, error_code: str = "API_ERROR", details: Optional[Dict[str, Any]] = None,
+                 headers: Optional[Dict[str, str]] = None):
         """初始化API异常
         
         Args:
@@ -20,12 +23,14 @@ class APIError(Exception):
             status_code: HTTP状态码
             error_code: 错误代码
             details: 额外的错误详情
+            headers: 附加到错误响应上的HTTP头（如 Retry-After）
         """
         super().__init__(message)
         self.message = message
         self.status_code = status_code
         self.error_code = error_code
         self.details = details or {}
+        self.headers = headers or {}
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式
@@ -33,15 +38,21 @@ class APIError(Exception):
         Returns:
             包含错误信息的字典
         """
-        result = {
-            'code': self.error_code,
-            'message': self.message
-        }
+        if not self.details:
+            return {'code': self.error_code, 'message': self.message}
+        return {'code': self.error_code, 'message': self.message, 'details': self.details}
+    
+    def to_json_bytes(self) -> bytes:
+        """序列化为完整的错误响应体
         
-        if self.details:
-            result['details'] = self.details
-            
-        return result
+        Returns:
+            包含 success/error/timestamp 的JSON字节串
+        """
+        return json_dumps({
+            'success': False,
+            'error': self.to_dict(),
+            'timestamp': iso_timestamp()
+        })
     
     def __str__(self) -> str:
         return f"APIError({self.error_code}): {self.message}"
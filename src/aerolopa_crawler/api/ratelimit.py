@@ -0,0 +1,144 @@
+"""API限流模块
+
+提供基于Redis的滑动窗口限流器，Redis不可用时回退到进程内令牌桶。
+"""
+
+import math
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+try:
+    import redis  # type: ignore
+except ImportError:
+    # 可选依赖；未安装时仅使用进程内限流
+    redis = None
+
+
+logger = logging.getLogger(__name__)
+
+# 滑动窗口计数：按窗口分桶计数，用上一桶按剩余比例加权近似滑动窗口，
+# 每个客户端只占用两个整数键
+# KEYS: 当前桶、上一桶  ARGV: 最大请求数、上一桶权重、键过期时间(ms)
+# 返回 {是否允许, 上一桶计数, 当前桶计数}
+_SLIDING_WINDOW_LUA = """
+local limit = tonumber(ARGV[1])
+local weight = tonumber(ARGV[2])
+local previous = tonumber(redis.call('GET', KEYS[2]) or 0)
+local current = tonumber(redis.call('GET', KEYS[1]) or 0)
+if previous * weight + current >= limit then
+    return {0, previous, current}
+end
+redis.call('INCR', KEYS[1])
+redis.call('PEXPIRE', KEYS[1], ARGV[3])
+return {1, previous, current + 1}
+"""
+
+
+class SlidingWindowLimiter:
+    """滑动窗口限流器
+
+    配置了Redis时，通过Lua脚本（EVALSHA）在一次往返内完成分桶计数，限额在所有
+    gunicorn worker之间共享；否则使用进程内令牌桶，每个客户端只保存
+    (剩余令牌, 上次补充时间)，最多保留 `max_keys` 个客户端。
+    """
+
+    KEY_PREFIX = "aerolopa:ratelimit:"
+
+    def __init__(self, redis_client=None, max_keys: int = 10000):
+        """初始化限流器
+
+        Args:
+            redis_client: Redis客户端，为None时仅使用进程内限流
+            max_keys: 进程内最多跟踪的客户端数量
+        """
+        self._script = redis_client.register_script(_SLIDING_WINDOW_LUA) if redis_client else None
+        self._max_keys = max_keys
+        # 按最近访问排序，最久未访问的在前
+        self._local: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def hit(self, key: str, max_requests: int, window_seconds: int) -> Tuple[bool, int]:
+        """记录一次请求并判断是否放行
+
+        Args:
+            key: 限流键（通常为客户端IP）
+            max_requests: 时间窗口内最大请求数
+            window_seconds: 时间窗口大小（秒）
+
+        Returns:
+            (是否允许, 建议的重试等待秒数)
+        """
+        if self._script is not None:
+            try:
+                return self._hit_redis(key, max_requests, window_seconds)
+            except redis.RedisError as e:
+                logger.warning(f"Redis rate limit failed, using local limiter: {str(e)}")
+        return self._hit_local(key, max_requests, window_seconds)
+
+    def _hit_redis(self, key: str, max_requests: int, window_seconds: int) -> Tuple[bool, int]:
+        now = time.time()
+        bucket = int(now // window_seconds)
+        elapsed = (now % window_seconds) / window_seconds
+        prefix = f"{self.KEY_PREFIX}{key}:{window_seconds}:"
+        allowed, previous, current = self._script(
+            keys=[f"{prefix}{bucket}", f"{prefix}{bucket - 1}"],
+            args=[max_requests, 1 - elapsed, window_seconds * 2000],
+        )
+        if allowed:
+            return True, 0
+
+        # 估算加权计数降到限额以下所需的时间
+        previous, current = int(previous), int(current)
+        if current >= max_requests:
+            wait = (1 - elapsed) + max(0.0, 1 - max_requests / current)
+        else:
+            wait = max(0.0, 1 - (max_requests - current) / previous - elapsed)
+        return False, max(1, math.ceil(wait * window_seconds))
+
+    def _hit_local(self, key: str, max_requests: int, window_seconds: int) -> Tuple[bool, int]:
+        now = time.monotonic()
+        rate = max_requests / window_seconds
+
+        with self._lock:
+            tokens, last_refill = self._local.pop(key, (float(max_requests), now))
+            tokens = min(float(max_requests), tokens + (now - last_refill) * rate)
+
+            # 闲置超过一个窗口的桶已补满，与不存在等价，可直接丢弃
+            stale_before = now - window_seconds
+            while self._local:
+                oldest_key = next(iter(self._local))
+                if self._local[oldest_key][1] >= stale_before and len(self._local) < self._max_keys:
+                    break
+                del self._local[oldest_key]
+
+            if tokens < 1:
+                self._local[key] = (tokens, now)
+                return False, math.ceil((1 - tokens) / rate)
+
+            self._local[key] = (tokens - 1, now)
+            return True, 0
+
+
+_limiter: Optional[SlidingWindowLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> SlidingWindowLimiter:
+    """获取全局限流器
+
+    设置了 `REDIS_URL` 且安装了redis时使用Redis，否则使用进程内限流。
+    """
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                client = None
+                redis_url = os.environ.get("REDIS_URL")
+                if redis_url and redis is not None:
+                    client = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+                _limiter = SlidingWindowLimiter(client)
+    return _limiter
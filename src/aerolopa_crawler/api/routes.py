@@ -3,11 +3,17 @@
 定义所有API端点的路由处理逻辑。
 """
 
+import io
 import os
+import time
+import mimetypes
+import threading
 import psutil
-from datetime import datetime, timedelta
+from urllib.parse import quote
+from datetime import datetime
+from typing import Any, Dict, Optional
 
-from flask import Blueprint, request, jsonify, send_file, current_app
+from flask import Blueprint, request, jsonify, send_file, current_app, has_app_context, url_for
 
 from ..config import Config
 from ..airlines import get_airline_info, get_all_airlines
@@ -18,11 +24,13 @@ from .validators import (
     validate_iata_code_with_message, validate_aircraft_model_with_message
 )
 from .utils import (
-    check_local_seatmap_cache, filter_aircraft_images,
-    optimize_image, get_cached_image, save_cached_image,
-    calculate_cache_stats, calculate_data_stats, clear_cache_directory
+    check_local_seatmap_cache, generate_cache_key,
+    optimize_image, get_cached_image, save_cached_image_async,
+    calculate_directory_stats, clear_cache_directory,
+    invalidate_seatmap_index, iso_timestamp, json_dumps
 )
-from .decorators import error_handler, rate_limit, log_request, cache_response
+from .decorators import error_handler, rate_limit, log_request, cache_response, get_json_body
+from .tasks import IMAGE_EXTENSIONS, submit_crawl, get_task_status, wait_for_task
 
 
 # 创建蓝图
@@ -30,41 +38,148 @@ api_bp = Blueprint('api', __name__)
 main_bp = Blueprint('main', __name__)
 
 # 全局变量
+# 当前进程已处理的座位图请求数
 request_counter = 0
+request_counter_lock = threading.Lock()
 start_time = datetime.now()
+config_instance = None
 crawler_instance = None
+# 后台线程每秒采样一次CPU使用率，请求处理中直接读取
+cpu_usage_percent = 0.0
+cpu_sampler = None
+cpu_sampler_lock = threading.Lock()
+# 系统资源快照 (过期时间, (内存, 磁盘))，避免频繁的健康检查反复调用 psutil
+SYSTEM_SNAPSHOT_TTL = 5
+system_snapshot = (0.0, None)
+# 目录状态 路径 -> (过期时间, 状态)，目录很少变化，缓存时间更长
+DIRECTORY_STATUS_TTL = 60
+directory_status_cache = {}
+
+
+def get_request_count() -> int:
+    """获取当前进程已处理的座位图请求数"""
+    return request_counter
+
+
+def _sample_cpu_usage() -> None:
+    """持续采样CPU使用率（后台线程）"""
+    global cpu_usage_percent
+    while True:
+        cpu_usage_percent = psutil.cpu_percent(interval=1)
+
+
+def get_cpu_percent() -> float:
+    """获取最近一秒的CPU使用率
+
+    采样线程在首次调用时启动；fork 后子进程中线程已不存在，会重新启动。
+    """
+    global cpu_sampler
+    if cpu_sampler is None or not cpu_sampler.is_alive():
+        with cpu_sampler_lock:
+            if cpu_sampler is None or not cpu_sampler.is_alive():
+                cpu_sampler = threading.Thread(
+                    target=_sample_cpu_usage, name='aerolopa-cpu-sampler', daemon=True
+                )
+                cpu_sampler.start()
+    return cpu_usage_percent
+
+
+def get_system_snapshot():
+    """获取内存和磁盘使用情况（缓存 SYSTEM_SNAPSHOT_TTL 秒）
+
+    Returns:
+        (psutil.virtual_memory(), psutil.disk_usage('/'))
+    """
+    global system_snapshot
+    now = time.monotonic()
+    expires, snapshot = system_snapshot
+    if snapshot is None or now >= expires:
+        snapshot = (psutil.virtual_memory(), psutil.disk_usage('/'))
+        system_snapshot = (now + SYSTEM_SNAPSHOT_TTL, snapshot)
+    return snapshot
+
+
+def get_directory_status(path: str) -> Dict[str, Any]:
+    """获取目录是否存在及是否可写（缓存 DIRECTORY_STATUS_TTL 秒）"""
+    now = time.monotonic()
+    cached = directory_status_cache.get(path)
+    if cached is None or now >= cached[0]:
+        exists = os.path.exists(path)
+        status = {
+            'path': path,
+            'exists': exists,
+            'writable': exists and os.access(path, os.W_OK)
+        }
+        cached = (now + DIRECTORY_STATUS_TTL, status)
+        directory_status_cache[path] = cached
+    return cached[1]
+
+
+def get_config() -> Config:
+    """获取配置
+
+    优先使用 create_app 保存在应用中的配置；在应用上下文之外（如后台任务）
+    使用全局默认配置实例。
+    """
+    global config_instance
+    if has_app_context():
+        config = current_app.config.get('AEROLOPA_CONFIG')
+        if config is not None:
+            return config
+    if config_instance is None:
+        config_instance = Config()
+    return config_instance
 
 
 def get_crawler() -> AerolopaCrawler:
     """获取全局爬虫实例"""
     global crawler_instance
     if crawler_instance is None:
-        config = Config()
-        crawler_instance = AerolopaCrawler(config)
+        crawler_instance = AerolopaCrawler(get_config())
     return crawler_instance
 
 
+# 预先序列化的JSON模板中的占位符
+TIMESTAMP_PLACEHOLDER = '__TIMESTAMP__'
+BASE_URL_PLACEHOLDER = '__BASE_URL__'
+
+
+def _render_json(template: bytes, base_url: Optional[str] = None):
+    """用当前时间戳（及基础URL）填充预先序列化的JSON模板并返回响应"""
+    body = template.replace(
+        json_dumps(TIMESTAMP_PLACEHOLDER), json_dumps(iso_timestamp())
+    )
+    if base_url is not None:
+        body = body.replace(json_dumps(BASE_URL_PLACEHOLDER), json_dumps(base_url))
+    return current_app.response_class(body, mimetype='application/json')
+
+
+# API信息，启动时序列化一次
+INDEX_TEMPLATE = json_dumps({
+    'name': 'AeroLOPA API',
+    'version': '2.0.0',
+    'description': '航空座位图数据API服务',
+    'endpoints': {
+        'airlines': '/api/v1/airlines',
+        'airline_info': '/api/v1/airlines/<iata_code>',
+        'seatmap': '/api/v1/seatmap',
+        'task': '/api/v1/tasks/<task_id>',
+        'image': '/image/<iata_code>/<filename>',
+        'health': '/health',
+        'docs': '/docs',
+        'metrics': '/metrics',
+        'system': '/system',
+        'stats': '/stats'
+    },
+    'timestamp': TIMESTAMP_PLACEHOLDER
+})
+
+
 @main_bp.route('/')
 @log_request
 def index():
     """根路径 - API信息"""
-    return jsonify({
-        'name': 'AeroLOPA API',
-        'version': '2.0.0',
-        'description': '航空座位图数据API服务',
-        'endpoints': {
-            'airlines': '/api/v1/airlines',
-            'airline_info': '/api/v1/airlines/<iata_code>',
-            'seatmap': '/api/v1/seatmap',
-            'image': '/image/<iata_code>/<filename>',
-            'health': '/health',
-            'docs': '/docs',
-            'metrics': '/metrics',
-            'system': '/system',
-            'stats': '/stats'
-        },
-        'timestamp': datetime.now().isoformat()
-    })
+    return _render_json(INDEX_TEMPLATE)
 
 
 @main_bp.route('/health')
@@ -72,33 +187,24 @@ def index():
 def health_check():
     """健康检查端点"""
     
-    config = Config()
+    config = get_config()
     
     # 检查目录状态
     directories_status = {
-        'images_dir': {
-            'path': config.image.cache_dir,
-            'exists': os.path.exists(config.image.cache_dir),
-            'writable': os.access(config.image.cache_dir, os.W_OK) if os.path.exists(config.image.cache_dir) else False
-        },
-        'output_dir': {
-            'path': config.crawler.output_dir,
-            'exists': os.path.exists(config.crawler.output_dir),
-            'writable': os.access(config.crawler.output_dir, os.W_OK) if os.path.exists(config.crawler.output_dir) else False
-        }
+        'images_dir': get_directory_status(config.image.cache_dir),
+        'output_dir': get_directory_status(config.crawler.output_dir)
     }
     
     # 系统资源
-    memory = psutil.virtual_memory()
-    disk = psutil.disk_usage('/')
+    memory, disk = get_system_snapshot()
     
     uptime = datetime.now() - start_time
     
     return jsonify({
         'status': 'healthy',
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': iso_timestamp(),
         'uptime': str(uptime),
-        'request_count': request_counter,
+        'request_count': get_request_count(),
         'system': {
             'memory_usage': f"{memory.percent}%",
             'memory_available': f"{memory.available / (1024**3):.2f} GB",
@@ -120,7 +226,7 @@ def get_airlines():
         'success': True,
         'data': airlines,
         'count': len(airlines),
-        'timestamp': datetime.now().isoformat()
+        'timestamp': iso_timestamp()
     })
 
 
@@ -143,10 +249,14 @@ def get_airline_details(iata_code: str):
     return jsonify({
         'success': True,
         'data': airline_info,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': iso_timestamp()
     })
 
 
+# 同步座位图请求等待爬取完成的最长时间（秒），超时后返回任务ID
+SEATMAP_CRAWL_TIMEOUT = 25
+
+
 @api_bp.route('/seatmap', methods=['GET', 'POST'])
 @error_handler
 @rate_limit(max_requests=30, window_seconds=3600)
@@ -154,18 +264,21 @@ def get_airline_details(iata_code: str):
 def get_seatmap():
     """获取航空公司机型座位图"""
     global request_counter
-    request_counter += 1
+    with request_counter_lock:
+        request_counter += 1
     
     # 获取参数
     if request.method == 'POST':
-        data = request.get_json() or {}
+        data = get_json_body() or {}
         airline = data.get('airline', '').strip().upper()
         aircraft = data.get('aircraft', '').strip()
         force_refresh = data.get('force_refresh', False)
+        async_mode = data.get('async', False) is True
     else:
         airline = request.args.get('airline', '').strip().upper()
         aircraft = request.args.get('aircraft', '').strip()
         force_refresh = request.args.get('force_refresh', 'false').lower() == 'true'
+        async_mode = request.args.get('async', 'false').lower() == 'true'
     
     # 验证参数
     if not airline:
@@ -178,21 +291,22 @@ def get_seatmap():
     validate_aircraft_model_with_message(aircraft)
     
     # 验证航空公司支持
-    from ..airlines import get_supported_iata_codes
-    supported_codes = get_supported_iata_codes()
-    if airline not in supported_codes:
+    from ..airlines import get_supported_iata_codes, is_supported_airline
+    if not is_supported_airline(airline):
         raise APIError(
             f"不支持的航空公司: {airline}", 
             400, 
             "AIRLINE_NOT_SUPPORTED",
-            {'supported_airlines': supported_codes}
+            {'supported_airlines': get_supported_iata_codes()}
         )
     
-    config = Config()
+    config = get_config()
     
     # 检查本地缓存（如果不强制刷新）
     if not force_refresh:
-        cached_images = check_local_seatmap_cache(config.image.cache_dir, airline, aircraft)
+        cached_images = check_local_seatmap_cache(
+            config.image.cache_dir, airline, aircraft, IMAGE_EXTENSIONS
+        )
         if cached_images:
             return jsonify({
                 'success': True,
@@ -201,59 +315,75 @@ def get_seatmap():
                 'aircraft': aircraft,
                 'images': cached_images,
                 'count': len(cached_images),
-                'timestamp': datetime.now().isoformat()
+                'timestamp': iso_timestamp()
             })
-    
-    # 执行爬取
+
+    # 爬取在后台任务中执行：异步模式立即返回 202，否则最多等待
+    # SEATMAP_CRAWL_TIMEOUT 秒，超时同样转为 202，避免长时间占用请求线程
     try:
-        crawler = get_crawler()
-        results = crawler.crawl_airline_seatmaps(
-            airline_code=airline,
-            aircraft_model=aircraft
-        )
-        
-        if not results or not results.get('images'):
-            raise APIError(
-                f"未找到 {airline} {aircraft} 的座位图数据",
-                404,
-                "SEATMAP_NOT_FOUND"
-            )
-        
-        # 过滤匹配的图片
-        filtered_images = filter_aircraft_images(results['images'], aircraft)
-        
-        if not filtered_images:
-            raise APIError(
-                f"未找到匹配的 {aircraft} 座位图",
-                404,
-                "AIRCRAFT_NOT_FOUND"
-            )
-        
-        # 限制图片数量
-        max_images = 10
-        if len(filtered_images) > max_images:
-            filtered_images = filtered_images[:max_images]
-        
-        return jsonify({
-            'success': True,
-            'source': 'crawled',
-            'airline': airline,
-            'aircraft': aircraft,
-            'images': filtered_images,
-            'count': len(filtered_images),
-            'timestamp': datetime.now().isoformat()
-        })
-        
+        task_id = submit_crawl(airline, aircraft)
+        if async_mode or 'respond-async' in request.headers.get('Prefer', ''):
+            return _task_accepted(task_id)
+        result = wait_for_task(task_id, SEATMAP_CRAWL_TIMEOUT)
+    except APIError:
+        raise
     except Exception as e:
-        if isinstance(e, APIError):
-            raise
-        
         raise APIError(
             f"爬取座位图时发生错误: {str(e)}",
             500,
             "CRAWL_ERROR"
         )
 
+    if result is None:
+        return _task_accepted(task_id)
+
+    if not result['images']:
+        raise APIError(
+            f"未找到 {airline} {aircraft} 的座位图数据",
+            404,
+            "SEATMAP_NOT_FOUND"
+        )
+
+    return jsonify({
+        'success': True,
+        'source': 'crawled',
+        'airline': airline,
+        'aircraft': aircraft,
+        'images': result['images'],
+        'count': result['count'],
+        'timestamp': iso_timestamp()
+    })
+
+
+def _task_accepted(task_id: str):
+    """返回 202 响应，告知客户端通过任务状态接口获取结果"""
+    status_url = url_for('api.get_task', task_id=task_id)
+    response = jsonify({
+        'success': True,
+        'task_id': task_id,
+        'status_url': status_url,
+        'timestamp': iso_timestamp()
+    })
+    return response, 202, {'Location': status_url}
+
+
+@api_bp.route('/tasks/<task_id>')
+@error_handler
+@log_request
+def get_task(task_id: str):
+    """查询后台爬取任务状态"""
+    status = get_task_status(task_id)
+    if status is None:
+        raise APIError(f"任务不存在: {task_id}", 404, "TASK_NOT_FOUND")
+
+    status['success'] = True
+    status['timestamp'] = iso_timestamp()
+    return jsonify(status)
+
+
+# 图片浏览器缓存时间（秒），与图片文件的刷新周期（24小时）一致
+IMAGE_MAX_AGE = 86400
+
 
 @main_bp.route('/image/<iata_code>/<filename>')
 @error_handler
@@ -269,21 +399,20 @@ def serve_image(iata_code: str, filename: str):
     quality = request.args.get('quality', 85, type=int)
     format_type = request.args.get('format', '').lower()
     
-    validate_image_params(width, height, quality, format_type)
+    validate_image_params()
     
-    config = Config()
+    config = get_config()
     
     # 构建图片路径（优先读取 data 目录缓存）
     image_path = os.path.join(config.image.cache_dir, iata_code.upper(), filename)
 
-    # 判断文件是否需要更新：不存在或超过24小时
-    need_fetch = True
-    if os.path.exists(image_path):
-        modified_time = datetime.fromtimestamp(os.path.getmtime(image_path))
-        if datetime.now() - modified_time <= timedelta(hours=24):
-            need_fetch = False
+    # 判断文件是否需要更新：不存在或超过24小时；一次 stat 同时得到是否存在和修改时间
+    try:
+        last_modified = os.stat(image_path).st_mtime
+    except OSError:
+        last_modified = None
 
-    if need_fetch:
+    if last_modified is None or time.time() - last_modified > IMAGE_MAX_AGE:
         try:
             crawler = get_crawler()
             url = f"{config.crawler.base_url}/{iata_code.lower()}/{filename}"
@@ -293,6 +422,7 @@ def serve_image(iata_code: str, filename: str):
             with open(image_path, 'wb') as f:
                 for chunk in response.iter_content(chunk_size=8192):
                     f.write(chunk)
+            last_modified = os.stat(image_path).st_mtime
         except Exception as e:
             raise APIError(
                 f"图片获取失败: {str(e)}",
@@ -300,7 +430,7 @@ def serve_image(iata_code: str, filename: str):
                 "CRAWL_ERROR"
             )
 
-    if not os.path.exists(image_path):
+    if last_modified is None:
         raise APIError(
             f"图片文件不存在: {filename}",
             404,
@@ -310,29 +440,83 @@ def serve_image(iata_code: str, filename: str):
     # 检查是否需要优化
     if width or height or quality != 85 or format_type:
         # 生成缓存键
-        cache_key = f"{iata_code}_{filename}_{width}_{height}_{quality}_{format_type}"
-        
-        # 尝试从缓存获取
-        cached_image = get_cached_image(config.image.cache_dir, cache_key)
-        if cached_image:
-            return send_file(cached_image, as_attachment=False)
+        cache_key = generate_cache_key(
+            iata_code, filename,
+            width=width, height=height, quality=quality, format_type=format_type
+        )
         
-        # 优化图片并缓存
-        try:
-            optimized_path = optimize_image(
-                image_path, width, height, quality, format_type
+        # 优化结果由原图和参数唯一确定，客户端已有相同版本时直接返回304
+        etag = f"{cache_key}-{int(last_modified)}"
+        if request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+            response.set_etag(etag)
+            response.cache_control.public = True
+            response.cache_control.max_age = IMAGE_MAX_AGE
+            return response
+
+        # 尝试从缓存获取，未命中时在内存中优化并直接返回
+        image_data = get_cached_image(
+            config.image.cache_dir, cache_key, config.api.cache_timeout
+        )
+        if image_data is None:
+            # 只指定一边时另一边不限制（校验上限为4000像素）
+            max_size = (width or 4000, height or 4000)
+            # 未显式指定质量时传 None，已是JPEG且无需缩放的图片可直接返回原始数据
+            requested_quality = quality if 'quality' in request.args else None
+            image_data = optimize_image(
+                image_path, requested_quality, max_size, config.image.quality
             )
-            
-            if optimized_path != image_path:
-                # 保存到缓存
-                save_cached_image(config.image.cache_dir, cache_key, optimized_path)
-                return send_file(optimized_path, as_attachment=False)
-        
-        except Exception as e:
-            current_app.logger.warning(f"图片优化失败: {str(e)}")
-    
+
+            # 后台写入缓存，不阻塞响应
+            save_cached_image_async(config.image.cache_dir, cache_key, image_data)
+
+        # optimize_image 统一输出 JPEG
+        response = send_file(
+            io.BytesIO(image_data),
+            mimetype='image/jpeg',
+            etag=etag,
+            last_modified=last_modified,
+            max_age=IMAGE_MAX_AGE,
+            conditional=True
+        )
+        response.cache_control.public = True
+        return response
+
     # 返回原始图片
-    return send_file(image_path, as_attachment=False)
+    return _send_image(image_path, config)
+
+
+def _send_image(image_path: str, config: Config):
+    """发送缓存目录中的图片文件
+
+    配置了 `x_accel_prefix` 时只返回 X-Accel-Redirect 头，由 nginx 直接发送文件；
+    否则交给 send_file，WSGI 服务器提供 wsgi.file_wrapper 时（如 gunicorn）
+    使用 sendfile 传输，不经过 Python 读写缓冲。
+    """
+    prefix = config.api.x_accel_prefix
+    relative_path = os.path.relpath(image_path, config.image.cache_dir)
+    if prefix and not relative_path.startswith(os.pardir):
+        response = current_app.response_class(
+            mimetype=mimetypes.guess_type(image_path)[0] or 'application/octet-stream'
+        )
+        response.headers['X-Accel-Redirect'] = (
+            f"{prefix.rstrip('/')}/{quote(relative_path.replace(os.sep, '/'))}"
+        )
+        # nginx 会保留 Cache-Control，并自行处理条件请求
+        response.cache_control.public = True
+        response.cache_control.max_age = IMAGE_MAX_AGE
+        return response
+
+    # 相对路径会被 Flask 按应用根目录解析，这里统一转为绝对路径；
+    # conditional 模式下根据 ETag/Last-Modified 返回304或处理Range请求
+    response = send_file(
+        os.path.abspath(image_path),
+        as_attachment=False,
+        conditional=True,
+        max_age=IMAGE_MAX_AGE
+    )
+    response.cache_control.public = True
+    return response
 
 
 @main_bp.route('/metrics')
@@ -341,17 +525,18 @@ def get_metrics():
     """获取实时性能指标"""
     
     uptime = datetime.now() - start_time
-    memory = psutil.virtual_memory()
-    cpu_percent = psutil.cpu_percent(interval=1)
+    memory, _ = get_system_snapshot()
+    cpu_percent = get_cpu_percent()
+    request_count = get_request_count()
     
     return jsonify({
         'uptime_seconds': int(uptime.total_seconds()),
-        'request_count': request_counter,
-        'requests_per_minute': round(request_counter / max(uptime.total_seconds() / 60, 1), 2),
+        'request_count': request_count,
+        'requests_per_minute': round(request_count / max(uptime.total_seconds() / 60, 1), 2),
         'memory_usage_percent': memory.percent,
         'memory_available_gb': round(memory.available / (1024**3), 2),
         'cpu_usage_percent': cpu_percent,
-        'timestamp': datetime.now().isoformat()
+        'timestamp': iso_timestamp()
     })
 
 
@@ -359,9 +544,8 @@ def get_metrics():
 @log_request
 def get_system_info():
     """获取系统资源使用情况"""
-    memory = psutil.virtual_memory()
-    disk = psutil.disk_usage('/')
-    cpu_percent = psutil.cpu_percent(interval=1)
+    memory, disk = get_system_snapshot()
+    cpu_percent = get_cpu_percent()
     
     return jsonify({
         'cpu': {
@@ -380,7 +564,7 @@ def get_system_info():
             'used_gb': round(disk.used / (1024**3), 2),
             'usage_percent': disk.percent
         },
-        'timestamp': datetime.now().isoformat()
+        'timestamp': iso_timestamp()
     })
 
 
@@ -390,7 +574,7 @@ def get_system_info():
 def clear_cache():
     """清理缓存"""
     try:
-        config = Config()
+        config = get_config()
         
         # 清理Flask缓存
         cache = current_app.extensions.get('cache')
@@ -399,12 +583,13 @@ def clear_cache():
         
         # 清理图片缓存目录
         cleared_files = clear_cache_directory(config.image.cache_dir)
+        invalidate_seatmap_index()
         
         return jsonify({
             'success': True,
             'message': '缓存清理完成',
             'cleared_files': cleared_files,
-            'timestamp': datetime.now().isoformat()
+            'timestamp': iso_timestamp()
         })
         
     except Exception as e:
@@ -420,29 +605,26 @@ def clear_cache():
 def get_enhanced_stats():
     """获取增强版API统计信息"""
     
-    config = Config()
+    config = get_config()
     
     # 基础统计
     uptime = datetime.now() - start_time
+    request_count = get_request_count()
     
-    # 缓存统计
-    cache_stats = calculate_cache_stats(config.image.cache_dir)
-    
-    # 数据目录统计
-    data_stats = calculate_data_stats(config.image.cache_dir)
+    # 缓存和数据目录统计（同一目录，一次遍历）
+    cache_stats, data_stats = calculate_directory_stats(config.image.cache_dir)
     
     # 系统资源
-    memory = psutil.virtual_memory()
-    disk = psutil.disk_usage('/')
-    cpu_percent = psutil.cpu_percent(interval=1)
+    memory, disk = get_system_snapshot()
+    cpu_percent = get_cpu_percent()
     
     return jsonify({
         'api': {
             'version': '2.0.0',
             'uptime_seconds': int(uptime.total_seconds()),
             'uptime_human': str(uptime),
-            'request_count': request_counter,
-            'requests_per_minute': round(request_counter / max(uptime.total_seconds() / 60, 1), 2),
+            'request_count': request_count,
+            'requests_per_minute': round(request_count / max(uptime.total_seconds() / 60, 1), 2),
             'start_time': start_time.isoformat()
         },
         'cache': cache_stats,
@@ -459,102 +641,114 @@ def get_enhanced_stats():
             'cache_dir': config.image.cache_dir,
             'supported_airlines': len(get_all_airlines())
         },
-        'timestamp': datetime.now().isoformat()
+        'timestamp': iso_timestamp()
     })
 
 
-@main_bp.route('/docs')
-@log_request
-def api_docs():
-    """API文档"""
-    docs = {
-        'title': 'AeroLOPA API Documentation',
-        'version': '2.0.0',
-        'description': '航空座位图数据API服务文档',
-        'base_url': request.host_url.rstrip('/'),
-        'endpoints': {
-            'GET /': {
-                'description': 'API基本信息',
-                'parameters': {},
-                'response': 'API信息和端点列表'
-            },
-            'GET /health': {
-                'description': '健康检查',
-                'parameters': {},
-                'response': '系统状态和资源使用情况'
-            },
-            'GET /api/v1/airlines': {
-                'description': '获取支持的航空公司列表',
-                'parameters': {},
-                'response': '航空公司列表'
-            },
-            'GET /api/v1/airlines/<iata_code>': {
-                'description': '获取指定航空公司信息',
-                'parameters': {
-                    'iata_code': '航空公司IATA代码（2位字母）'
-                },
-                'response': '航空公司详细信息'
-            },
-            'GET|POST /api/v1/seatmap': {
-                'description': '获取航空公司机型座位图',
-                'parameters': {
-                    'airline': '航空公司IATA代码（必需）',
-                    'aircraft': '机型名称（必需）',
-                    'format': '返回格式（json，默认）',
-                    'force_refresh': '强制刷新（true/false，默认false）'
-                },
-                'response': '座位图数据和图片列表'
-            },
-            'GET /image/<iata_code>/<filename>': {
-                'description': '获取座位图图片',
-                'parameters': {
-                    'iata_code': '航空公司IATA代码',
-                    'filename': '图片文件名',
-                    'width': '图片宽度（可选）',
-                    'height': '图片高度（可选）',
-                    'quality': '图片质量1-100（可选，默认85）',
-                    'format': '图片格式（jpeg/png/webp，可选）'
-                },
-                'response': '图片文件'
+# API文档，启动时序列化一次，请求时只替换时间戳和基础URL
+API_DOCS_TEMPLATE = json_dumps({
+    'title': 'AeroLOPA API Documentation',
+    'version': '2.0.0',
+    'description': '航空座位图数据API服务文档',
+    'base_url': BASE_URL_PLACEHOLDER,
+    'endpoints': {
+        'GET /': {
+            'description': 'API基本信息',
+            'parameters': {},
+            'response': 'API信息和端点列表'
+        },
+        'GET /health': {
+            'description': '健康检查',
+            'parameters': {},
+            'response': '系统状态和资源使用情况'
+        },
+        'GET /api/v1/airlines': {
+            'description': '获取支持的航空公司列表',
+            'parameters': {},
+            'response': '航空公司列表'
+        },
+        'GET /api/v1/airlines/<iata_code>': {
+            'description': '获取指定航空公司信息',
+            'parameters': {
+                'iata_code': '航空公司IATA代码（2位字母）'
             },
-            'GET /metrics': {
-                'description': '获取实时性能指标',
-                'parameters': {},
-                'response': '性能指标数据'
+            'response': '航空公司详细信息'
+        },
+        'GET|POST /api/v1/seatmap': {
+            'description': '获取航空公司机型座位图',
+            'parameters': {
+                'airline': '航空公司IATA代码（必需）',
+                'aircraft': '机型名称（必需）',
+                'format': '返回格式（json，默认）',
+                'force_refresh': '强制刷新（true/false，默认false）',
+                'async': '后台执行爬取并返回202和任务ID（true/false，默认false）'
             },
-            'GET /system': {
-                'description': '获取系统资源使用情况',
-                'parameters': {},
-                'response': '系统资源数据'
+            'response': '座位图数据和图片列表'
+        },
+        'GET /api/v1/tasks/<task_id>': {
+            'description': '查询后台爬取任务状态',
+            'parameters': {
+                'task_id': '提交座位图请求时返回的任务ID'
             },
-            'POST /cache/clear': {
-                'description': '清理缓存',
-                'parameters': {},
-                'response': '清理结果'
+            'response': '任务状态和结果'
+        },
+        'GET /image/<iata_code>/<filename>': {
+            'description': '获取座位图图片',
+            'parameters': {
+                'iata_code': '航空公司IATA代码',
+                'filename': '图片文件名',
+                'width': '图片宽度（可选）',
+                'height': '图片高度（可选）',
+                'quality': '图片质量1-100（可选，默认85）',
+                'format': '图片格式（jpeg/png/webp，可选）'
             },
-            'GET /stats': {
-                'description': '获取增强版API统计信息',
-                'parameters': {},
-                'response': '详细统计信息'
-            }
+            'response': '图片文件'
         },
-        'error_codes': {
-            'INVALID_IATA_CODE': '无效的IATA代码',
-            'INVALID_AIRCRAFT_MODEL': '无效的机型名称',
-            'MISSING_PARAMETER': '缺少必需参数',
-            'AIRLINE_NOT_FOUND': '航空公司不存在',
-            'SEATMAP_NOT_FOUND': '座位图不存在',
-            'AIRCRAFT_NOT_FOUND': '机型不存在',
-            'IMAGE_NOT_FOUND': '图片不存在',
-            'TOO_MANY_REQUESTS': '请求频率超限',
-            'CRAWL_ERROR': '爬取错误',
-            'INTERNAL_ERROR': '服务器内部错误'
+        'GET /metrics': {
+            'description': '获取实时性能指标',
+            'parameters': {},
+            'response': '性能指标数据'
         },
-        'rate_limits': {
-            '/api/v1/seatmap': '每小时30次请求',
-            'other_endpoints': '每小时50次请求'
+        'GET /system': {
+            'description': '获取系统资源使用情况',
+            'parameters': {},
+            'response': '系统资源数据'
         },
-        'timestamp': datetime.now().isoformat()
-    }
-    
-    return jsonify(docs)
\ No newline at end of file
+        'POST /cache/clear': {
+            'description': '清理缓存',
+            'parameters': {},
+            'response': '清理结果'
+        },
+        'GET /stats': {
+            'description': '获取增强版API统计信息',
+            'parameters': {},
+            'response': '详细统计信息'
+        }
+    },
+    'error_codes': {
+        'INVALID_IATA_CODE': '无效的IATA代码',
+        'INVALID_AIRCRAFT_MODEL': '无效的机型名称',
+        'MISSING_PARAMETER': '缺少必需参数',
+        'AIRLINE_NOT_FOUND': '航空公司不存在',
+        'SEATMAP_NOT_FOUND': '座位图不存在',
+        'AIRCRAFT_NOT_FOUND': '机型不存在',
+        'IMAGE_NOT_FOUND': '图片不存在',
+        'TOO_MANY_REQUESTS': '请求频率超限',
+        'CRAWL_ERROR': '爬取错误',
+        'INTERNAL_ERROR': '服务器内部错误'
+    },
+    'rate_limits': {
+        '/api/v1/seatmap': '每小时30次请求',
+        'other_endpoints': '每小时50次请求'
+    },
+    'timestamp': TIMESTAMP_PLACEHOLDER
+})
+
+
+@main_bp.route('/docs')
+@log_request
+def api_docs():
+    """API文档"""
+    return _render_json(
+        API_DOCS_TEMPLATE, base_url=request.host_url.rstrip('/')
+    )
\ No newline at end of file
@@ -0,0 +1,273 @@
+"""API后台任务模块
+
+把耗时的座位图爬取移出请求线程：设置了 CELERY_BROKER_URL 且安装了 Celery
+时投递到 Celery worker，否则提交到进程内线程池。
+
+Celery 模式需要单独启动 worker，否则任务只会入队而不会执行::
+
+    celery -A aerolopa_crawler.api.tasks:celery_app worker --loglevel=info
+"""
+
+import os
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple
+
+from .exceptions import APIError
+from .utils import check_local_seatmap_cache, invalidate_seatmap_index
+
+try:
+    from celery import Celery  # type: ignore
+    from celery.exceptions import TimeoutError as CeleryTimeoutError  # type: ignore
+except ImportError:
+    # 可选依赖；未安装时使用进程内线程池
+    Celery = None
+    CeleryTimeoutError = None
+
+
+logger = logging.getLogger(__name__)
+
+# 爬取完成后从缓存目录中收集的图片格式
+IMAGE_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.webp']
+# 单次返回的最大图片数
+MAX_IMAGES = 10
+# 结果保留时间（秒），与 cache_response 的缓存时间一致
+RESULT_TTL = 3600
+# 投递前写入结果后端的状态：Celery 对未知任务ID同样返回 PENDING，
+# 以此区分已提交但尚未执行的任务
+SUBMITTED_STATE = 'SUBMITTED'
+
+
+def crawl_seatmap(airline: str, aircraft: str) -> Dict[str, Any]:
+    """爬取航空公司座位图并返回匹配机型的图片
+
+    Args:
+        airline: 航空公司IATA代码
+        aircraft: 机型
+
+    Returns:
+        包含图片列表的结果字典
+    """
+    return _seatmap_result(_crawl_airline(airline), airline, aircraft)
+
+
+def _crawl_airline(airline: str) -> str:
+    """爬取航空公司的全部座位图，返回图片缓存目录"""
+    from .routes import get_crawler
+
+    crawler = get_crawler()
+    crawler.crawl_airline_seatmaps(airline)
+    invalidate_seatmap_index(airline)
+    return crawler.config.image.cache_dir
+
+
+def _seatmap_result(cache_dir: str, airline: str, aircraft: str) -> Dict[str, Any]:
+    images = check_local_seatmap_cache(
+        cache_dir, airline, aircraft, IMAGE_EXTENSIONS
+    )[:MAX_IMAGES]
+    return {
+        'airline': airline,
+        'aircraft': aircraft,
+        'images': images,
+        'count': len(images)
+    }
+
+
+def _create_celery():
+    # 只认显式配置：REDIS_URL 用于限流，设置它不代表部署了 Celery worker
+    broker_url = os.environ.get('CELERY_BROKER_URL')
+    if Celery is None or not broker_url:
+        return None
+
+    app = Celery(
+        'aerolopa',
+        broker=broker_url,
+        backend=os.environ.get('CELERY_RESULT_BACKEND', broker_url)
+    )
+    app.conf.result_expires = RESULT_TTL
+    return app
+
+
+celery_app = _create_celery()
+crawl_seatmap_task = (
+    celery_app.task(name='aerolopa.crawl_seatmap')(crawl_seatmap) if celery_app else None
+)
+
+# 进程内回退：任务ID -> Future，只保留最近的任务
+_MAX_LOCAL_TASKS = 1000
+# 排队或执行中的航空公司爬取上限，超出时拒绝新的爬取
+MAX_PENDING_CRAWLS = 8
+# 拒绝时建议客户端的重试间隔（秒）
+BUSY_RETRY_AFTER = 30
+_local_executor: Optional[ThreadPoolExecutor] = None
+_local_tasks: "OrderedDict[str, Future]" = OrderedDict()
+_local_lock = threading.Lock()
+
+
+class _AirlineCrawl:
+    """一次排队或执行中的航空公司爬取，以及等待它的任务 (Future, 机型)"""
+
+    __slots__ = ('airline', 'waiters', 'started')
+
+    def __init__(self, airline: str) -> None:
+        self.airline = airline
+        self.waiters: List[Tuple[Future, str]] = []
+        self.started = False
+
+
+# 航空公司 -> 进行中的爬取；同一航空公司的任务共用一次爬取
+_airline_crawls: Dict[str, _AirlineCrawl] = {}
+
+
+def submit_crawl(airline: str, aircraft: str) -> str:
+    """提交后台爬取任务
+
+    进程内模式下，同一航空公司已在排队或执行的爬取会被复用，不会重复爬取。
+
+    Args:
+        airline: 航空公司IATA代码
+        aircraft: 机型
+
+    Returns:
+        任务ID
+
+    Raises:
+        APIError: 进程内排队的爬取已达 MAX_PENDING_CRAWLS 时返回 503
+    """
+    global _local_executor
+    task_id = uuid.uuid4().hex
+    if crawl_seatmap_task is not None:
+        # 先记录提交状态再投递，worker 写入的状态会覆盖它
+        celery_app.backend.store_result(task_id, None, SUBMITTED_STATE)
+        crawl_seatmap_task.apply_async((airline, aircraft), task_id=task_id)
+        return task_id
+
+    task: Future = Future()
+    crawl_future = None
+    with _local_lock:
+        crawl = _airline_crawls.get(airline)
+        if crawl is None:
+            if len(_airline_crawls) >= MAX_PENDING_CRAWLS:
+                raise APIError(
+                    "后台爬取任务过多，请稍后重试",
+                    503,
+                    "SERVICE_UNAVAILABLE",
+                    headers={'Retry-After': str(BUSY_RETRY_AFTER)}
+                )
+            if _local_executor is None:
+                _local_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='aerolopa-task')
+            crawl = _airline_crawls[airline] = _AirlineCrawl(airline)
+            crawl_future = _local_executor.submit(_run_airline_crawl, crawl)
+        elif crawl.started:
+            task.set_running_or_notify_cancel()
+        crawl.waiters.append((task, aircraft))
+
+        _local_tasks[task_id] = task
+        while len(_local_tasks) > _MAX_LOCAL_TASKS:
+            _local_tasks.popitem(last=False)
+
+    # 在锁外注册：爬取已完成时回调会立即在当前线程执行
+    if crawl_future is not None:
+        crawl_future.add_done_callback(partial(_finish_airline_crawl, crawl))
+    return task_id
+
+
+def _run_airline_crawl(crawl: _AirlineCrawl) -> str:
+    with _local_lock:
+        crawl.started = True
+        for task, _ in crawl.waiters:
+            task.set_running_or_notify_cancel()
+    return _crawl_airline(crawl.airline)
+
+
+def _finish_airline_crawl(crawl: _AirlineCrawl, crawl_future: Future) -> None:
+    """爬取结束后为每个等待的任务按机型生成结果"""
+    with _local_lock:
+        if _airline_crawls.get(crawl.airline) is crawl:
+            del _airline_crawls[crawl.airline]
+        waiters = list(crawl.waiters)
+
+    error = crawl_future.exception()
+    for task, aircraft in waiters:
+        if error is not None:
+            task.set_exception(error)
+            continue
+        try:
+            task.set_result(_seatmap_result(crawl_future.result(), crawl.airline, aircraft))
+        except Exception as e:
+            task.set_exception(e)
+
+
+def wait_for_task(task_id: str, timeout: float) -> Optional[Dict[str, Any]]:
+    """等待任务完成并返回结果
+
+    超时不会取消任务，任务继续在后台执行，可通过 get_task_status 查询。
+
+    Args:
+        task_id: submit_crawl 返回的任务ID
+        timeout: 最长等待时间（秒）
+
+    Returns:
+        任务结果；超时返回None
+
+    Raises:
+        Exception: 任务执行失败时抛出任务中的异常
+    """
+    if celery_app is not None:
+        try:
+            return celery_app.AsyncResult(task_id).get(timeout=timeout)
+        except CeleryTimeoutError:
+            return None
+
+    with _local_lock:
+        future = _local_tasks[task_id]
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeoutError:
+        return None
+
+
+def get_task_status(task_id: str) -> Optional[Dict[str, Any]]:
+    """查询后台任务状态
+
+    进程内模式下任务只对提交它的进程可见。
+
+    Args:
+        task_id: 任务ID
+
+    Returns:
+        包含 state 以及 result/error 的字典；任务不存在时返回None
+    """
+    if celery_app is not None:
+        result = celery_app.AsyncResult(task_id)
+        if result.state == 'PENDING':
+            # 结果后端中没有记录：不是本服务提交的任务，或结果已过期
+            return None
+        state = 'PENDING' if result.state == SUBMITTED_STATE else result.state
+        status = {'task_id': task_id, 'state': state}
+        if result.successful():
+            status['result'] = result.result
+        elif result.failed():
+            status['error'] = str(result.result)
+        return status
+
+    with _local_lock:
+        future = _local_tasks.get(task_id)
+    if future is None:
+        return None
+
+    status = {'task_id': task_id}
+    if not future.done():
+        status['state'] = 'STARTED' if future.running() else 'PENDING'
+    elif future.exception() is not None:
+        status['state'] = 'FAILURE'
+        status['error'] = str(future.exception())
+    else:
+        status['state'] = 'SUCCESS'
+        status['result'] = future.result()
+    return status
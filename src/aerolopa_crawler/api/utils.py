@@ -6,12 +6,81 @@
 import os
 import io
 import re
+import json
+import time
 import hashlib
+import tempfile
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from datetime import datetime
-from typing import Optional, Dict, Any, List, Tuple
+from typing import Optional, Callable, Dict, Any, Iterator, List, Set, Tuple
 
 from PIL import Image, ImageOps
 
+try:
+    import orjson  # type: ignore
+except ImportError:
+    # 可选依赖；未安装时回退到标准库json
+    orjson = None
+
+
+def json_dumps(obj: Any) -> bytes:
+    """将对象序列化为UTF-8编码的JSON字节串
+
+    安装了orjson时使用orjson，否则使用标准库json。
+
+    Args:
+        obj: 待序列化的对象
+
+    Returns:
+        JSON字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(data: bytes) -> Any:
+    """解析JSON字节串
+
+    安装了orjson时使用orjson，否则使用标准库json。
+
+    Args:
+        data: JSON字节串
+
+    Returns:
+        解析后的对象
+
+    Raises:
+        ValueError: JSON格式无效时
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# (整秒时间戳, ISO格式字符串)，整体替换以保证线程安全
+_timestamp_cache: Tuple[int, str] = (0, "")
+
+
+def iso_timestamp() -> str:
+    """返回当前本地时间的ISO格式字符串（精确到秒）
+
+    同一秒内的调用复用已格式化的字符串，避免每个响应都构造datetime。
+
+    Returns:
+        形如 2024-01-01T12:00:00 的时间字符串
+    """
+    global _timestamp_cache
+    now = int(time.time())
+    cached_second, cached_value = _timestamp_cache
+    if cached_second != now:
+        cached_value = datetime.fromtimestamp(now).isoformat()
+        _timestamp_cache = (now, cached_value)
+    return cached_value
+
 
 def standardize_aircraft_model(aircraft_model: str) -> str:
     """标准化机型名称
@@ -46,21 +115,30 @@ def standardize_aircraft_model(aircraft_model: str) -> str:
     return standardized
 
 
-def generate_cache_key(iata_code: str, filename: str, **kwargs) -> str:
-    """生成缓存键
+def generate_cache_key(
+    iata_code: str,
+    filename: str,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+    quality: Optional[int] = None,
+    format_type: Optional[str] = None,
+) -> str:
+    """生成图片缓存键
 
     Args:
         iata_code: 航空公司代码
         filename: 文件名
-        **kwargs: 额外参数
+        width: 图片宽度
+        height: 图片高度
+        quality: 图片质量
+        format_type: 图片格式
 
     Returns:
-        MD5哈希的缓存键
+        BLAKE2b哈希的缓存键（32位十六进制）
     """
-    key_data = f"{iata_code}_{filename}"
-    for k, v in sorted(kwargs.items()):
-        key_data += f"_{k}_{v}"
-    return hashlib.md5(key_data.encode()).hexdigest()
+    key_data = f"{iata_code}|{filename}|{width}|{height}|{quality}|{format_type}"
+    # 仅用作缓存键，无需密码学强度；BLAKE2b 在标准库中且比 MD5 更快
+    return hashlib.blake2b(key_data.encode(), digest_size=16).hexdigest()
 
 
 def optimize_image(
@@ -82,22 +160,34 @@ def optimize_image(
     """
     try:
         with Image.open(image_path) as img:
-            # 转换为RGB模式（如果需要）
-            if img.mode in ("RGBA", "LA", "P"):
-                background = Image.new("RGB", img.size, (255, 255, 255))
-                if img.mode == "P":
-                    img = img.convert("RGBA")
-                background.paste(
-                    img, mask=img.split()[-1] if img.mode == "RGBA" else None
-                )
-                img = background
+            # Image.open 只读取文件头；已是JPEG且无需缩放、未指定质量时
+            # 直接返回原始数据，省去一次完整的解码和编码
+            needs_resize = bool(max_size) and (
+                img.width > max_size[0] or img.height > max_size[1]
+            )
+            if not needs_resize and quality is None and img.format == "JPEG":
+                with open(image_path, "rb") as f:
+                    return f.read()
+
+            # 调色板图片只能用最近邻缩放，先转为RGBA
+            if img.mode in ("LA", "P"):
+                img = img.convert("RGBA")
 
-            # 调整尺寸
-            if max_size and (img.width > max_size[0] or img.height > max_size[1]):
-                img.thumbnail(max_size, Image.Resampling.LANCZOS)
+            # 先缩小再做后续处理，旋转和去透明只需处理缩小后的像素；
+            # thumbnail 会先用 draft/reduce 快速缩到接近目标尺寸（JPEG 在解码时
+            # 即按 1/2~1/8 缩小），再用 LANCZOS 完成剩余部分
+            if needs_resize:
+                img.thumbnail(max_size, Image.Resampling.LANCZOS, reducing_gap=2.0)
 
-            # 自动旋转
-            img = ImageOps.exif_transpose(img)
+            # 自动旋转（需在去透明前进行，合成后的新图片不带EXIF信息）；
+            # 原地处理，无需旋转时不复制图片
+            ImageOps.exif_transpose(img, in_place=True)
+
+            # 转换为RGB模式（如果需要），只取出透明通道作为蒙版
+            if img.mode == "RGBA":
+                background = Image.new("RGB", img.size, (255, 255, 255))
+                background.paste(img, mask=img.getchannel("A"))
+                img = background
 
             # 保存到内存
             output = io.BytesIO()
@@ -132,15 +222,18 @@ def get_cached_image(
     """
     try:
         cache_file = os.path.join(cache_dir, f"{cache_key}.jpg")
-        if os.path.exists(cache_file):
-            # 检查缓存是否过期
-            cache_time = os.path.getmtime(cache_file)
-            if datetime.now().timestamp() - cache_time < cache_timeout:
-                with open(cache_file, "rb") as f:
-                    return f.read()
-            else:
-                # 删除过期缓存
-                os.remove(cache_file)
+        try:
+            cache_time = os.stat(cache_file).st_mtime
+        except FileNotFoundError:
+            return None
+
+        # 检查缓存是否过期
+        if time.time() - cache_time < cache_timeout:
+            with open(cache_file, "rb") as f:
+                return f.read()
+
+        # 删除过期缓存
+        os.remove(cache_file)
         return None
     except Exception:
         return None
@@ -160,18 +253,81 @@ def save_cached_image(cache_dir: str, cache_key: str, image_data: bytes) -> bool
     try:
         os.makedirs(cache_dir, exist_ok=True)
         cache_file = os.path.join(cache_dir, f"{cache_key}.jpg")
-        with open(cache_file, "wb") as f:
-            f.write(image_data)
+        # 先写临时文件再原子替换，并发读取不会读到写了一半的图片
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(image_data)
+            os.replace(tmp_path, cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
         return True
     except Exception:
         return False
 
 
+# 后台缓存写入：共用一个小线程池，排队的写入超过上限时直接放弃
+# （缓存只是加速，下次未命中会重新生成）
+_CACHE_WRITE_MAX_PENDING = 32
+_cache_writer: Optional[ThreadPoolExecutor] = None
+_cache_write_pending: Set[str] = set()
+_cache_write_lock = threading.Lock()
+
+
+def save_cached_image_async(cache_dir: str, cache_key: str, image_data: bytes) -> bool:
+    """在后台线程中保存图片到缓存，不阻塞调用方
+
+    同一缓存键已在排队时不会重复写入。
+
+    Args:
+        cache_dir: 缓存目录
+        cache_key: 缓存键
+        image_data: 图片数据
+
+    Returns:
+        是否已提交写入
+    """
+    global _cache_writer
+    with _cache_write_lock:
+        if cache_key in _cache_write_pending or len(_cache_write_pending) >= _CACHE_WRITE_MAX_PENDING:
+            return False
+        if _cache_writer is None:
+            _cache_writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix="aerolopa-cache")
+        _cache_write_pending.add(cache_key)
+    try:
+        _cache_writer.submit(_save_cached_image_task, cache_dir, cache_key, image_data)
+    except RuntimeError:
+        # 解释器退出时线程池已关闭
+        with _cache_write_lock:
+            _cache_write_pending.discard(cache_key)
+        return False
+    return True
+
+
+def _save_cached_image_task(cache_dir: str, cache_key: str, image_data: bytes) -> None:
+    try:
+        save_cached_image(cache_dir, cache_key, image_data)
+    finally:
+        with _cache_write_lock:
+            _cache_write_pending.discard(cache_key)
+
+
+# 本地座位图扫描结果缓存：(数据目录, 航空公司, 机型, 格式) -> (过期时间, 图片列表)
+SEATMAP_INDEX_TTL = 60
+_SEATMAP_INDEX_MAX_KEYS = 1024
+_seatmap_index: "OrderedDict[Tuple, Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+_seatmap_index_lock = threading.Lock()
+
+
 def check_local_seatmap_cache(
     data_dir: str, iata_code: str, aircraft_model: str, image_formats: List[str]
 ) -> List[Dict[str, Any]]:
     """检查本地座位图缓存
 
+    非空的扫描结果在内存中保留 SEATMAP_INDEX_TTL 秒，期间重复查询不访问文件系统；
+    目录内容变化后可调用 invalidate_seatmap_index 立即失效。
+
     Args:
         data_dir: 数据目录
         iata_code: 航空公司代码
@@ -181,50 +337,105 @@ def check_local_seatmap_cache(
     Returns:
         匹配的图片信息列表
     """
+    key = (data_dir, iata_code, aircraft_model, tuple(image_formats))
+    now = time.monotonic()
+    with _seatmap_index_lock:
+        cached = _seatmap_index.get(key)
+        if cached is not None and cached[0] > now:
+            _seatmap_index.move_to_end(key)
+            return list(cached[1])
+
+    images = _scan_local_seatmaps(data_dir, iata_code, aircraft_model, image_formats)
+    # 空结果不缓存，新下载的图片可以立即被发现
+    if images:
+        with _seatmap_index_lock:
+            _seatmap_index[key] = (now + SEATMAP_INDEX_TTL, images)
+            _seatmap_index.move_to_end(key)
+            while len(_seatmap_index) > _SEATMAP_INDEX_MAX_KEYS:
+                _seatmap_index.popitem(last=False)
+    return list(images)
+
+
+def invalidate_seatmap_index(iata_code: Optional[str] = None) -> None:
+    """使本地座位图扫描缓存失效
+
+    Args:
+        iata_code: 航空公司代码，为None时清空全部
+    """
+    with _seatmap_index_lock:
+        if iata_code is None:
+            _seatmap_index.clear()
+            return
+        for key in [k for k in _seatmap_index if k[1] == iata_code]:
+            del _seatmap_index[key]
+
+
+def _scan_local_seatmaps(
+    data_dir: str, iata_code: str, aircraft_model: str, image_formats: List[str]
+) -> List[Dict[str, Any]]:
+    """扫描航空公司目录，返回匹配机型的图片信息"""
     try:
         airline_dir = os.path.join(data_dir, iata_code)
-        if not os.path.exists(airline_dir):
+        if not os.path.isdir(airline_dir):
             return []
 
+        # str.endswith 接受元组，一次调用完成全部扩展名的比较
+        extensions = tuple("." + ext.lower().lstrip(".") for ext in image_formats)
+        matches_aircraft = aircraft_matcher(aircraft_model)
         images = []
-        for filename in os.listdir(airline_dir):
-            if any(filename.lower().endswith(ext) for ext in image_formats):
+        with os.scandir(airline_dir) as entries:
+            for entry in entries:
+                filename = entry.name
+                if not filename.lower().endswith(extensions):
+                    continue
                 # 检查文件名是否包含机型信息
-                if is_aircraft_match(filename, aircraft_model):
-                    file_path = os.path.join(airline_dir, filename)
-                    file_stats = os.stat(file_path)
-
-                    images.append(
-                        {
-                            "filename": filename,
-                            "file_path": file_path,
-                            "url": f"/api/v1/image/{iata_code}/{filename}",
-                            "optimized_urls": {
-                                "thumbnail": f"/api/v1/image/{iata_code}/{filename}?width=300&compress=true",
-                                "medium": f"/api/v1/image/{iata_code}/{filename}?width=800&compress=true",
-                                "high_quality": f"/api/v1/image/{iata_code}/{filename}?quality=95&compress=true",
-                            },
-                            "size": file_stats.st_size,
-                            "modified_time": datetime.fromtimestamp(
-                                file_stats.st_mtime
-                            ).isoformat(),
-                            "aircraft_match": True,
-                        }
-                    )
+                if not matches_aircraft(filename):
+                    continue
+
+                file_stats = entry.stat()
+                images.append(
+                    {
+                        "filename": filename,
+                        "file_path": entry.path,
+                        "url": f"/api/v1/image/{iata_code}/{filename}",
+                        "optimized_urls": {
+                            "thumbnail": f"/api/v1/image/{iata_code}/{filename}?width=300&compress=true",
+                            "medium": f"/api/v1/image/{iata_code}/{filename}?width=800&compress=true",
+                            "high_quality": f"/api/v1/image/{iata_code}/{filename}?quality=95&compress=true",
+                        },
+                        "size": file_stats.st_size,
+                        "modified_time": datetime.fromtimestamp(
+                            file_stats.st_mtime
+                        ).isoformat(),
+                        "aircraft_match": True,
+                    }
+                )
 
         return images
     except Exception:
         return []
 
 
+# filter_aircraft_images 输出的字段及缺省值
+_IMAGE_INFO_DEFAULTS = (
+    ("filename", ""),
+    ("file_path", ""),
+    ("url", ""),
+    ("size", 0),
+    ("modified_time", ""),
+    ("source_url", ""),
+)
+
+
 def filter_aircraft_images(
-    crawl_result: Dict, aircraft_model: str
+    crawl_result: Dict, aircraft_model: str, limit: Optional[int] = None
 ) -> List[Dict[str, Any]]:
     """从爬取结果中过滤匹配的机型图片
 
     Args:
         crawl_result: 爬取结果
         aircraft_model: 机型
+        limit: 最多返回的图片数，达到后停止匹配；为None时不限制
 
     Returns:
         匹配的图片信息列表
@@ -233,26 +444,31 @@ def filter_aircraft_images(
 
     try:
         # crawl_result 应该包含爬取到的图片信息
-        if "images" in crawl_result:
-            for img_info in crawl_result["images"]:
-                if is_aircraft_match(img_info.get("filename", ""), aircraft_model):
-                    images.append(
-                        {
-                            "filename": img_info.get("filename", ""),
-                            "file_path": img_info.get("file_path", ""),
-                            "url": img_info.get("url", ""),
-                            "size": img_info.get("size", 0),
-                            "modified_time": img_info.get("modified_time", ""),
-                            "aircraft_match": True,
-                            "source_url": img_info.get("source_url", ""),
-                        }
-                    )
+        matches_aircraft = aircraft_matcher(aircraft_model)
+        for img_info in crawl_result.get("images", ()):
+            if not matches_aircraft(img_info.get("filename", "")):
+                continue
+            image = {key: img_info.get(key, default) for key, default in _IMAGE_INFO_DEFAULTS}
+            image["aircraft_match"] = True
+            images.append(image)
+            if limit is not None and len(images) >= limit:
+                break
 
         return images
     except Exception:
         return []
 
 
+# 机型匹配关键词（大写）
+AIRCRAFT_KEYWORDS = frozenset({
+    "A320", "A321", "A330", "A340", "A350", "A380",
+    "B737", "B747", "B757", "B767", "B777", "B787",
+    "E170", "E175", "E190", "E195",
+    "CRJ", "ERJ", "ATR", "Q400",
+})
+_DIGITS_RE = re.compile(r"\d+")
+
+
 def is_aircraft_match(filename: str, aircraft_model: str) -> bool:
     """检查文件名是否匹配指定机型
 
@@ -265,53 +481,53 @@ def is_aircraft_match(filename: str, aircraft_model: str) -> bool:
     """
     if not filename or not aircraft_model:
         return False
+    return aircraft_matcher(aircraft_model)(filename)
+
+
+@lru_cache(maxsize=256)
+def aircraft_matcher(aircraft_model: str) -> Callable[[str], bool]:
+    """为指定机型构建文件名匹配函数
+
+    机型相关的大写转换、关键词和数字提取只做一次，适合对大量文件名逐一匹配；
+    匹配函数按机型缓存，重复调用（如 is_aircraft_match）不会重新编译正则。
 
-    # 将文件名和机型都转换为大写进行比较
-    filename_upper = filename.upper()
+    Args:
+        aircraft_model: 机型
+
+    Returns:
+        接收文件名、返回是否匹配的函数
+    """
     aircraft_upper = aircraft_model.upper()
+    # 机型本身及其中出现的关键词合并为一个正则，对文件名只扫描一遍
+    keywords = [aircraft_upper] + [k for k in AIRCRAFT_KEYWORDS if k in aircraft_upper]
+    keyword_re = re.compile('|'.join(map(re.escape, keywords)))
+    # 提取数字部分进行匹配（如A320, B737等）
+    aircraft_numbers = frozenset(_DIGITS_RE.findall(aircraft_upper))
 
-    # 直接匹配
-    if aircraft_upper in filename_upper:
-        return True
+    def match(filename: str) -> bool:
+        if not filename or not aircraft_upper:
+            return False
+
+        filename_upper = filename.upper()
 
-    # 使用配置中的关键词进行匹配
-    aircraft_keywords = [
-        "A320",
-        "A321",
-        "A330",
-        "A340",
-        "A350",
-        "A380",
-        "B737",
-        "B747",
-        "B757",
-        "B767",
-        "B777",
-        "B787",
-        "E170",
-        "E175",
-        "E190",
-        "E195",
-        "CRJ",
-        "ERJ",
-        "ATR",
-        "Q400",
-    ]
-
-    for keyword in aircraft_keywords:
-        if keyword.upper() in aircraft_upper and keyword.upper() in filename_upper:
+        # 直接匹配或关键词匹配
+        if keyword_re.search(filename_upper):
             return True
 
-    # 提取数字部分进行匹配（如A320, B737等）
-    aircraft_numbers = re.findall(r"\d+", aircraft_upper)
-    filename_numbers = re.findall(r"\d+", filename_upper)
+        return bool(aircraft_numbers) and not aircraft_numbers.isdisjoint(
+            _DIGITS_RE.findall(filename_upper)
+        )
+
+    return match
 
-    if aircraft_numbers and filename_numbers:
-        for num in aircraft_numbers:
-            if num in filename_numbers:
-                return True
 
-    return False
+def _size_stats(files: int, size: int) -> Dict[str, Any]:
+    """构造文件数量和大小的统计字典"""
+    return {
+        "files": files,
+        "size_bytes": size,
+        "size_mb": round(size / 1024 / 1024, 2),
+    }
 
 
 def calculate_cache_stats(cache_dir: str) -> Dict[str, Any]:
@@ -327,59 +543,105 @@ def calculate_cache_stats(cache_dir: str) -> Dict[str, Any]:
     cache_size = 0
 
     try:
-        if os.path.exists(cache_dir):
-            for filename in os.listdir(cache_dir):
-                file_path = os.path.join(cache_dir, filename)
-                if os.path.isfile(file_path):
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
                     cache_files += 1
-                    cache_size += os.path.getsize(file_path)
+                    cache_size += entry.stat().st_size
     except Exception:
         pass
 
-    return {
-        "files": cache_files,
-        "size_bytes": cache_size,
-        "size_mb": round(cache_size / 1024 / 1024, 2),
-    }
+    return _size_stats(cache_files, cache_size)
+
+
+# calculate_data_stats 统计的图片扩展名
+DATA_IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"})
+
+
+def _iter_files(directory: str, top_level: bool = True) -> Iterator[Tuple[os.DirEntry, bool]]:
+    """递归遍历目录下的文件，跳过缓存目录（名称包含 .cache）
+
+    Yields:
+        (文件条目, 是否位于 directory 第一层)
+    """
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if ".cache" not in entry.name:
+                    yield from _iter_files(entry.path, False)
+            elif entry.is_file():
+                yield entry, top_level
+
+
+# 目录统计缓存：目录 -> (过期时间, (缓存统计, 数据统计))
+DATA_STATS_TTL = 30
+_directory_stats_cache: Dict[str, Tuple[float, Tuple[Dict[str, Any], Dict[str, Any]]]] = {}
+
+
+def calculate_directory_stats(directory: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """一次遍历同时计算缓存统计和数据统计
+
+    缓存统计与 calculate_cache_stats 相同（第一层的所有文件），数据统计与
+    calculate_data_stats 相同（递归统计图片文件）。需要递归遍历整个目录，
+    结果缓存 DATA_STATS_TTL 秒。
+
+    Args:
+        directory: 数据目录
+
+    Returns:
+        (缓存统计信息, 数据统计信息)
+    """
+    now = time.monotonic()
+    cached = _directory_stats_cache.get(directory)
+    if cached is not None and cached[0] > now:
+        cache_stats, data_stats = cached[1]
+        return dict(cache_stats), dict(data_stats)
+
+    cache_files = cache_size = data_files = data_size = 0
+
+    try:
+        for entry, top_level in _iter_files(directory):
+            is_image = os.path.splitext(entry.name)[1].lower() in DATA_IMAGE_EXTENSIONS
+            if not (top_level or is_image):
+                continue
+            size = entry.stat().st_size
+            if top_level:
+                cache_files += 1
+                cache_size += size
+            if is_image:
+                data_files += 1
+                data_size += size
+    except Exception:
+        pass
+
+    stats = (_size_stats(cache_files, cache_size), _size_stats(data_files, data_size))
+    _directory_stats_cache[directory] = (now + DATA_STATS_TTL, stats)
+    return dict(stats[0]), dict(stats[1])
 
 
 def calculate_data_stats(data_dir: str) -> Dict[str, Any]:
     """计算数据目录统计信息
 
+    结果缓存 DATA_STATS_TTL 秒，见 calculate_directory_stats。
+
     Args:
         data_dir: 数据目录
 
     Returns:
         数据统计信息
     """
-    data_files = 0
-    data_size = 0
+    return calculate_directory_stats(data_dir)[1]
 
-    try:
-        if os.path.exists(data_dir):
-            for root, dirs, files in os.walk(data_dir):
-                if ".cache" in root:  # 跳过缓存目录
-                    continue
-                for file in files:
-                    if any(
-                        file.lower().endswith(ext)
-                        for ext in [".jpg", ".jpeg", ".png", ".gif", ".webp", ".bmp"]
-                    ):
-                        file_path = os.path.join(root, file)
-                        data_files += 1
-                        data_size += os.path.getsize(file_path)
-    except Exception:
-        pass
 
-    return {
-        "files": data_files,
-        "size_bytes": data_size,
-        "size_mb": round(data_size / 1024 / 1024, 2),
-    }
+# 优化图片缓存文件：{cache_key}.jpg，以及 save_cached_image 未完成的临时文件。
+# 缓存目录默认与爬虫输出目录相同（seatmaps.db、downloaded.txt 等），只能删除这两类文件
+_CACHE_ENTRY_RE = re.compile(r"(?:[0-9a-f]{32}\.jpg|tmp\w+\.tmp)")
 
 
 def clear_cache_directory(cache_dir: str) -> int:
-    """清理缓存目录
+    """清理缓存目录中的优化图片缓存
+
+    只删除 save_cached_image 写入的文件，不影响同目录下的数据库等文件。
 
     Args:
         cache_dir: 缓存目录
@@ -388,13 +650,13 @@ def clear_cache_directory(cache_dir: str) -> int:
         清理的文件数量
     """
     cleared_files = 0
+    _directory_stats_cache.pop(cache_dir, None)
 
     try:
-        if os.path.exists(cache_dir):
-            for filename in os.listdir(cache_dir):
-                file_path = os.path.join(cache_dir, filename)
-                if os.path.isfile(file_path):
-                    os.remove(file_path)
+        with os.scandir(cache_dir) as entries:
+            for entry in entries:
+                if entry.is_file() and _CACHE_ENTRY_RE.fullmatch(entry.name):
+                    os.remove(entry.path)
                     cleared_files += 1
     except Exception:
         pass
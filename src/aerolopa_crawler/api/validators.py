@@ -3,21 +3,24 @@
 提供请求参数验证功能。
 """
 
-import re
+import string
+import sys
 from typing import Tuple, Dict, Any, Optional
 from flask import request
 
-from ..airlines import get_supported_iata_codes
+from ..airlines import AIRLINES, get_supported_iata_codes
+from .decorators import get_json_body
 from .exceptions import APIError
+from .utils import AIRCRAFT_KEYWORDS  # noqa: F401  机型关键词，与文件名匹配共用一份
 
 
-# 机型关键词配置
-AIRCRAFT_KEYWORDS = [
-    'A320', 'A321', 'A330', 'A340', 'A350', 'A380',
-    'B737', 'B747', 'B757', 'B767', 'B777', 'B787',
-    'E170', 'E175', 'E190', 'E195',
-    'CRJ', 'ERJ', 'ATR', 'Q400'
-]
+# 机型允许的字符：字母、数字、连字符和空白；translate 删除这些字符后应为空串
+_AIRCRAFT_DELETE_TABLE = str.maketrans(
+    '', '', string.ascii_letters + string.digits + '-' + string.whitespace
+)
+
+# 支持的返回格式
+VALID_FORMATS = ('json', 'html')
 
 
 def validate_iata_code(iata_code: str) -> Tuple[bool, Optional[str]]:
@@ -29,17 +32,17 @@ def validate_iata_code(iata_code: str) -> Tuple[bool, Optional[str]]:
     Returns:
         (是否有效, 错误消息)
     """
+    # IATA代码为2-3个字母或数字且至少含一个字母（如 3K、9W）；
+    # 合法输入只经过这一个判断，出错时再区分原因
+    if (isinstance(iata_code, str) and 2 <= len(iata_code) <= 3
+            and iata_code.isascii() and iata_code.isalnum() and not iata_code.isdigit()):
+        return True, None
+    
     if not iata_code:
         return False, "IATA代码不能为空"
-    
     if not isinstance(iata_code, str):
         return False, "IATA代码必须是字符串"
-    
-    # IATA代码应该是2-3个字母
-    if not re.match(r'^[A-Za-z]{2,3}$', iata_code):
-        return False, "IATA代码格式无效，应为2-3个字母"
-    
-    return True, None
+    return False, "IATA代码格式无效，应为2-3个字母或数字（至少包含一个字母）"
 
 
 def validate_iata_code_with_message(iata_code: str) -> str:
@@ -54,11 +57,17 @@ def validate_iata_code_with_message(iata_code: str) -> str:
     Raises:
         APIError: 当IATA代码无效时
     """
+    # 已是标准形式的受支持代码（航司字典的键）直接返回，只需一次字典查找；
+    # 航司字典的键都符合 validate_iata_code 的格式，不会放过原本被拒绝的输入
+    if type(iata_code) is str and iata_code in AIRLINES:
+        return iata_code
+    
     is_valid, error_msg = validate_iata_code(iata_code)
     if not is_valid:
         raise APIError(error_msg, 400, "INVALID_IATA_CODE")
     
-    return iata_code.upper()
+    # 驻留字符串，与航司字典的键比较时走身份比较的快速路径
+    return sys.intern(iata_code.upper())
 
 
 def validate_aircraft_model(aircraft_model: str) -> Tuple[bool, Optional[str]]:
@@ -70,21 +79,18 @@ def validate_aircraft_model(aircraft_model: str) -> Tuple[bool, Optional[str]]:
     Returns:
         (是否有效, 错误消息)
     """
+    # 最多20个字符，只允许字母、数字、连字符和空格；出错时再区分原因
+    if (isinstance(aircraft_model, str) and 0 < len(aircraft_model) <= 20
+            and not aircraft_model.translate(_AIRCRAFT_DELETE_TABLE)):
+        return True, None
+    
     if not aircraft_model:
         return False, "机型不能为空"
-    
     if not isinstance(aircraft_model, str):
         return False, "机型必须是字符串"
-    
-    # 机型长度限制
     if len(aircraft_model) > 20:
         return False, "机型名称过长（最多20个字符）"
-    
-    # 机型格式检查：允许字母、数字、连字符和空格
-    if not re.match(r'^[A-Za-z0-9\-\s]+$', aircraft_model):
-        return False, "机型格式无效，只允许字母、数字、连字符和空格"
-    
-    return True, None
+    return False, "机型格式无效，只允许字母、数字、连字符和空格"
 
 
 def validate_aircraft_model_with_message(aircraft_model: str) -> str:
@@ -126,7 +132,7 @@ def validate_request_params(required_params: Dict[str, Any], optional_params: Di
     if request.method == 'GET':
         request_data = request.args
     else:
-        request_data = request.get_json() or {}
+        request_data = get_json_body() or {}
     
     # 验证必需参数
     for param_name, validator in required_params.items():
@@ -157,25 +163,26 @@ def validate_request_params(required_params: Dict[str, Any], optional_params: Di
         params[param_name] = value
     
     # 特殊验证：航空公司支持检查
+    # 直接查航空公司字典（区分大小写，与代码列表一致），只在出错时才生成完整的代码列表；
+    # 未经验证器处理的值可能不是字符串，同样按不支持处理
     if 'airline' in params:
-        supported_codes = get_supported_iata_codes()
-        if params['airline'] not in supported_codes:
+        airline = params['airline']
+        if not (isinstance(airline, str) and airline in AIRLINES):
             raise APIError(
                 f"不支持的航空公司: {params['airline']}", 
                 400, 
                 "AIRLINE_NOT_SUPPORTED",
-                {'supported_airlines': supported_codes}
+                {'supported_airlines': get_supported_iata_codes()}
             )
     
     # 验证返回格式
     if 'format' in params:
-        valid_formats = ['json', 'html']
-        if params['format'] not in valid_formats:
+        if params['format'] not in VALID_FORMATS:
             raise APIError(
                 f"不支持的返回格式: {params['format']}", 
                 400, 
                 "UNSUPPORTED_FORMAT",
-                {'supported_formats': valid_formats}
+                {'supported_formats': list(VALID_FORMATS)}
             )
     
     return params
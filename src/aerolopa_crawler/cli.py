@@ -6,10 +6,19 @@ import sys
 from typing import List
 
 from .config import load_config
-from .aerolopa_crawler import AerolopaCrawler
 from .airlines import get_supported_iata_codes
 
 
+def __getattr__(name: str):
+    # 爬虫模块依赖较重，只在真正抓取时导入；--list-airlines 不会加载
+    if name == "AerolopaCrawler":
+        from .aerolopa_crawler import AerolopaCrawler
+
+        globals()[name] = AerolopaCrawler
+        return AerolopaCrawler
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def setup_logging(verbose: bool = False) -> None:
     """配置日志输出"""
 
@@ -29,7 +38,7 @@ def list_supported_airlines() -> None:
     print("\n支持的航空公司：")
     print("-" * 50)
 
-    for iata, (chinese_name, english_name) in sorted(airlines.items()):
+    for iata, chinese_name, english_name in sorted(airlines):
         print(f"{iata:3} | {chinese_name:20} | {english_name}")
 
     print(f"\n共支持 {len(airlines)} 家航空公司")
@@ -38,16 +47,13 @@ def list_supported_airlines() -> None:
 def validate_airline_codes(airline_codes: List[str]) -> List[str]:
     """验证航空公司 IATA 代码"""
 
+    # 标准化并去重，保留输入顺序
+    codes = dict.fromkeys(code.upper().strip() for code in airline_codes)
     supported_codes = set(get_supported_iata_codes())
-    valid_codes: List[str] = []
-    invalid_codes: List[str] = []
+    invalid = codes.keys() - supported_codes
 
-    for code in airline_codes:
-        code = code.upper().strip()
-        if code in supported_codes:
-            valid_codes.append(code)
-        else:
-            invalid_codes.append(code)
+    valid_codes: List[str] = [code for code in codes if code not in invalid]
+    invalid_codes: List[str] = [code for code in codes if code in invalid]
 
     if invalid_codes:
         print(
@@ -66,7 +72,7 @@ def parse_airline_codes(codes_input: str) -> List[str]:
         return []
 
     codes = [code.strip().upper() for code in codes_input.split(",")]
-    return [code for code in codes if code]
+    return [sys.intern(code) for code in codes if code]
 
 
 def main() -> None:
@@ -91,6 +97,7 @@ def main() -> None:
     action_group.add_argument(
         "--airline",
         "-a",
+        type=parse_airline_codes,
         help="逗号分隔的航空公司 IATA 代码列表，例如 'CA,MU,CZ'",
     )
 
@@ -127,21 +134,21 @@ def main() -> None:
         # 加载配置
         config = load_config()
 
-        # 如指定输出目录则覆盖配置
+        # 如指定输出目录则覆盖配置（配置不可变，生成新的实例）
         if args.output_dir:
-            config.crawler.output_dir = args.output_dir
+            config = config.with_output_dir(args.output_dir)
 
-        # 初始化爬虫
-        crawler = AerolopaCrawler(config)
+        # 初始化爬虫（首次使用时才由模块 __getattr__ 导入爬虫模块）
+        crawler = getattr(sys.modules[__name__], "AerolopaCrawler")(config)
 
         # 决定抓取哪些航空公司
         if args.all_airlines:
             print("开始抓取所有支持的航空公司...")
             total_processed = crawler.crawl_all_airlines()
 
-        elif args.airline:
-            airline_codes = parse_airline_codes(args.airline)
-            valid_codes = validate_airline_codes(airline_codes)
+        elif args.airline is not None:
+            # argparse 已通过 parse_airline_codes 拆分为列表
+            valid_codes = validate_airline_codes(args.airline)
 
             if not valid_codes:
                 print("错误：未提供有效的航空公司代码", file=sys.stderr)
@@ -5,38 +5,89 @@ Loads from environment variables with sensible defaults.
 """
 from __future__ import annotations
 
+import logging
 import os
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+import sys
+from dataclasses import dataclass, field, replace
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, FrozenSet, List, Mapping, Optional, Sequence, Tuple
 
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# Aircraft model -> keywords that identify it, in recognition precedence order.
+# Built once at import; Config instances get a read-only copy.
+AIRCRAFT_FAMILIES: Dict[str, Tuple[str, ...]] = {
+    "A320": ("A320", "A319", "A321", "A318"),
+    "A330": ("A330", "A332", "A333"),
+    "A340": ("A340", "A342", "A343", "A345"),
+    "A350": ("A350", "A359"),
+    "A380": ("A380",),
+    "B737": ("B737", "737", "B738", "B739"),
+    "B747": ("B747", "747", "B744", "B748"),
+    "B757": ("B757", "757"),
+    "B767": ("B767", "767"),
+    "B777": ("B777", "777", "B772", "B773", "B77W"),
+    "B787": ("B787", "787", "B788", "B789"),
+}
+
+# Reverse index: keyword -> aircraft model, first family wins
+KEYWORD_TO_FAMILY: Dict[str, str] = {}
+for _model, _keywords in AIRCRAFT_FAMILIES.items():
+    for _keyword in _keywords:
+        KEYWORD_TO_FAMILY.setdefault(_keyword, _model)
+del _model, _keywords, _keyword
+
+AIRCRAFT_KEYWORD_SET: FrozenSet[str] = frozenset(KEYWORD_TO_FAMILY)
+
+# Config objects are shared (load_config is cached), so they are frozen; slots
+# keep instances small where supported (Python 3.10+)
+_DATACLASS_OPTIONS = {"frozen": True}
+if sys.version_info >= (3, 10):
+    _DATACLASS_OPTIONS["slots"] = True
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class CrawlerConfig:
     """Configuration for web crawling functionality."""
     base_url: str = "https://www.aerolopa.com"
     timeout: float = 15.0
     retries: int = 3
     delay: float = 1.0  # polite crawl delay (seconds)
+    rps: Optional[float] = None  # aggregate request rate (0 = unlimited); None derives it from delay
     user_agent: str = (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
         "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     )
     output_dir: str = "data"
     max_workers: int = 4
+    fast_parser: bool = True  # use selectolax (Lexbor) when installed
+
+    def rate_limit(self) -> Tuple[float, float]:
+        """Return (rate, burst) for the shared request rate limiter.
+
+        An explicit ``rps`` allows bursts of up to ``rps`` requests; otherwise
+        one request per ``delay`` seconds without bursting.
+        """
+        if self.rps is not None:
+            return self.rps, max(1.0, self.rps)
+        return (1.0 / self.delay if self.delay > 0 else 0.0), 1.0
     
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class APIConfig:
     """Configuration for API service."""
     host: str = "0.0.0.0"
     port: int = 5000
     debug: bool = False
-    cors_origins: List[str] = field(default_factory=lambda: ["*"])
+    cors_origins: Tuple[str, ...] = ("*",)
     cache_timeout: int = 3600  # seconds
     max_content_length: int = 16 * 1024 * 1024  # 16MB
+    x_accel_prefix: Optional[str] = None  # nginx internal location，设置后图片由 nginx 直接发送
     
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class LoggingConfig:
     """Configuration for logging."""
     level: str = "INFO"
@@ -45,18 +96,21 @@ class LoggingConfig:
     log_dir: str = "logs"
     max_bytes: int = 10 * 1024 * 1024  # 10MB
     backup_count: int = 5
+    json: bool = False  # 以JSON行格式输出日志，便于日志采集系统解析
     
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ImageConfig:
     """Configuration for image processing."""
     cache_dir: str = "data"  # 图片缓存目录，默认使用 data 目录
     max_size: tuple[int, int] = (1920, 1080)
     quality: int = 85
-    formats: List[str] = field(default_factory=lambda: ["JPEG", "PNG", "WEBP"])
+    formats: Tuple[str, ...] = ("JPEG", "PNG", "WEBP")
+    download_concurrency: int = 8  # 单个机型页面内并发下载图片的线程数
+    max_bytes: int = 20 * 1024 * 1024  # 单张图片下载上限（字节），0 表示不限制
     
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class Config:
     """Main configuration container."""
     crawler: CrawlerConfig = field(default_factory=CrawlerConfig)
@@ -64,20 +118,15 @@ class Config:
     logging: LoggingConfig = field(default_factory=LoggingConfig)
     image: ImageConfig = field(default_factory=ImageConfig)
     
-    # Aircraft model keywords for recognition
-    aircraft_keywords: Dict[str, List[str]] = field(default_factory=lambda: {
-        "A320": ["A320", "A319", "A321", "A318"],
-        "A330": ["A330", "A332", "A333"],
-        "A340": ["A340", "A342", "A343", "A345"],
-        "A350": ["A350", "A359"],
-        "A380": ["A380"],
-        "B737": ["B737", "737", "B738", "B739"],
-        "B747": ["B747", "747", "B744", "B748"],
-        "B757": ["B757", "757"],
-        "B767": ["B767", "767"],
-        "B777": ["B777", "777", "B772", "B773", "B77W"],
-        "B787": ["B787", "787", "B788", "B789"]
-    })
+    # Aircraft model keywords for recognition (read-only view; build a new
+    # mapping and use ``dataclasses.replace`` to customise)
+    aircraft_keywords: Mapping[str, Sequence[str]] = field(
+        default_factory=lambda: MappingProxyType(dict(AIRCRAFT_FAMILIES))
+    )
+
+    def with_output_dir(self, output_dir: str) -> Config:
+        """Return a copy whose crawler writes to ``output_dir``."""
+        return replace(self, crawler=replace(self.crawler, output_dir=output_dir))
 
 
 def _maybe_load_dotenv() -> None:
@@ -101,6 +150,18 @@ def _getenv_float(name: str, default: float) -> float:
         return default
 
 
+def _getenv_optional_float(name: str) -> Optional[float]:
+    """Get float value from environment variable, None if unset or malformed."""
+    val = os.getenv(name)
+    if not val:
+        return None
+    try:
+        return float(val)
+    except ValueError:
+        logger.warning("Ignoring invalid %s=%r", name, val)
+        return None
+
+
 def _getenv_int(name: str, default: int) -> int:
     """Get integer value from environment variable."""
     val = os.getenv(name)
@@ -128,22 +189,30 @@ def _getenv_list(name: str, default: List[str], separator: str = ",") -> List[st
     return [item.strip() for item in val.split(separator) if item.strip()]
 
 
+@lru_cache(maxsize=1)
 def load_config(config_path: Optional[str] = None) -> Config:
     """Load configuration from environment variables.
     
+    The result is cached, so every caller shares one (frozen) instance;
+    derive variants with ``dataclasses.replace``. Call
+    ``load_config.cache_clear()`` to pick up changed environment variables.
+    
     Environment variables use AEROLOPA_ prefix:
     - AEROLOPA_BASE_URL: Base URL for crawling
     - AEROLOPA_TIMEOUT: HTTP timeout in seconds
     - AEROLOPA_RETRIES: Number of retries
-    - AEROLOPA_DELAY: Crawl delay in seconds
+    - AEROLOPA_DELAY: Crawl delay in seconds (used when AEROLOPA_RPS is unset)
+    - AEROLOPA_RPS: Aggregate request rate, allowing bursts of that size
     - AEROLOPA_USER_AGENT: Custom user agent
     - AEROLOPA_OUTPUT_DIR: Output directory
     - AEROLOPA_API_HOST: API host
     - AEROLOPA_API_PORT: API port
     - AEROLOPA_API_DEBUG: Enable debug mode
+    - AEROLOPA_X_ACCEL_PREFIX: nginx internal location for serving images
     - AEROLOPA_LOG_LEVEL: Logging level
     - AEROLOPA_LOG_FILE: Log file path
     - AEROLOPA_LOG_DIR: Log directory path
+    - AEROLOPA_LOG_JSON: Emit logs as JSON lines
     """
     _maybe_load_dotenv()
     
@@ -153,13 +222,15 @@ def load_config(config_path: Optional[str] = None) -> Config:
         timeout=_getenv_float("AEROLOPA_TIMEOUT", 15.0),
         retries=_getenv_int("AEROLOPA_RETRIES", 3),
         delay=_getenv_float("AEROLOPA_DELAY", 1.0),
+        rps=_getenv_optional_float("AEROLOPA_RPS"),
         user_agent=os.getenv(
             "AEROLOPA_USER_AGENT",
             "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
             "(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         ),
         output_dir=os.getenv("AEROLOPA_OUTPUT_DIR", "data"),
-        max_workers=_getenv_int("AEROLOPA_MAX_WORKERS", 4)
+        max_workers=_getenv_int("AEROLOPA_MAX_WORKERS", 4),
+        fast_parser=_getenv_bool("AEROLOPA_FAST_PARSER", True)
     )
     
     # API configuration
@@ -167,9 +238,10 @@ def load_config(config_path: Optional[str] = None) -> Config:
         host=os.getenv("AEROLOPA_API_HOST", "0.0.0.0"),
         port=_getenv_int("AEROLOPA_API_PORT", 5000),
         debug=_getenv_bool("AEROLOPA_API_DEBUG", False),
-        cors_origins=_getenv_list("AEROLOPA_CORS_ORIGINS", ["*"]),
+        cors_origins=tuple(_getenv_list("AEROLOPA_CORS_ORIGINS", ["*"])),
         cache_timeout=_getenv_int("AEROLOPA_CACHE_TIMEOUT", 3600),
-        max_content_length=_getenv_int("AEROLOPA_MAX_CONTENT_LENGTH", 16 * 1024 * 1024)
+        max_content_length=_getenv_int("AEROLOPA_MAX_CONTENT_LENGTH", 16 * 1024 * 1024),
+        x_accel_prefix=os.getenv("AEROLOPA_X_ACCEL_PREFIX") or None
     )
     
     # Logging configuration
@@ -182,13 +254,16 @@ def load_config(config_path: Optional[str] = None) -> Config:
         file_path=os.getenv("AEROLOPA_LOG_FILE"),
         log_dir=os.getenv("AEROLOPA_LOG_DIR", "logs"),
         max_bytes=_getenv_int("AEROLOPA_LOG_MAX_BYTES", 10 * 1024 * 1024),
-        backup_count=_getenv_int("AEROLOPA_LOG_BACKUP_COUNT", 5)
+        backup_count=_getenv_int("AEROLOPA_LOG_BACKUP_COUNT", 5),
+        json=_getenv_bool("AEROLOPA_LOG_JSON", False)
     )
     
     # Image configuration
     image_config = ImageConfig(
         cache_dir=os.getenv("AEROLOPA_IMAGE_CACHE_DIR", "data"),
-        quality=_getenv_int("AEROLOPA_IMAGE_QUALITY", 85)
+        quality=_getenv_int("AEROLOPA_IMAGE_QUALITY", 85),
+        download_concurrency=_getenv_int("AEROLOPA_IMAGE_DOWNLOAD_CONCURRENCY", 8),
+        max_bytes=_getenv_int("AEROLOPA_IMAGE_MAX_BYTES", 20 * 1024 * 1024)
     )
     
     return Config(
@@ -1,13 +1,15 @@
 from __future__ import annotations
 
 import logging
-from typing import Iterable, Optional
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Iterable, List, Optional, Set, Union
+from urllib.parse import urlsplit
 
 from .http import HttpClient
-from .normalizers import normalize_record
+from .normalizers import serialize_record
 from .parsers import Parser
 from .storage import Storage
-from .throttle import Throttle
+from .throttle import Throttle, ThrottleRegistry
 
 
 class Crawler:
@@ -18,29 +20,74 @@ class Crawler:
         client: HttpClient,
         parser: Parser,
         storage: Storage,
-        throttle: Throttle,
+        throttle: Union[Throttle, ThrottleRegistry],
         logger: Optional[logging.Logger] = None,
+        max_workers: int = 4,
     ) -> None:
         self.client = client
         self.parser = parser
         self.storage = storage
         self.throttle = throttle
         self.logger = logger or logging.getLogger(__name__)
+        self.max_workers = max(1, max_workers)
+        # 成功的记录先缓存，每 `flush_every` 条批量写入一次
+        self.flush_every = 128
 
     def run(self, urls: Iterable[str]) -> int:
+        """并发抓取 URL，返回成功处理的数量
+
+        `urls` 按需迭代，可以是生成器；同时在途的任务不超过 `max_workers` 的两倍。
+        重复的 URL 会被跳过。抓取在最多 `max_workers` 个线程中进行；限速器在线程间
+        共享（`ThrottleRegistry` 按主机分别限速）。结果在当前线程中按批写入 `Storage`。
+        """
         count = 0
-        for url in urls:
-            url = url.strip()
-            if not url:
+        buffer: List[bytes] = []
+        pending: Set[Future] = set()
+        # 重复的 URL 只抓取一次
+        seen: Set[str] = set()
+        try:
+            with ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="crawler"
+            ) as executor:
+                for url in urls:
+                    url = url.strip()
+                    if not url or url in seen:
+                        continue
+                    seen.add(url)
+                    if len(pending) >= self.max_workers * 2:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        count += self._collect(done, buffer)
+                    pending.add(executor.submit(self._process_one, url))
+                count += self._collect(wait(pending).done, buffer)
+        finally:
+            if buffer:
+                self.storage.write_serialized(buffer)
+        return count
+
+    def _collect(self, futures: Iterable[Future], buffer: List[bytes]) -> int:
+        """把已完成任务的记录加入缓冲区，满 `flush_every` 条时写入，返回成功数"""
+        count = 0
+        for future in futures:
+            line = future.result()
+            if line is None:
                 continue
-            try:
-                self.throttle.wait()
-                html = self.client.get_text(url)
-                parsed = self.parser.parse(url, html)
-                normalized = normalize_record(parsed)
-                self.storage.write(normalized)
-                count += 1
-                self.logger.debug("ok: %s", url)
-            except Exception as exc:  # noqa: BLE001 - surface errors
-                self.logger.error("fail: %s -> %s", url, exc)
+            buffer.append(line)
+            count += 1
+            if len(buffer) >= self.flush_every:
+                self.storage.write_serialized(buffer)
+                buffer.clear()
         return count
+
+    def _process_one(self, url: str) -> Optional[bytes]:
+        """抓取并解析单个 URL，返回规范化后的 JSON 行；失败返回 None"""
+        try:
+            # ThrottleRegistry 按主机限速，Throttle 对所有主机共用一个间隔
+            self.throttle.wait_for(urlsplit(url).netloc)
+            html = self.client.get_text(url)
+            parsed = self.parser.parse(url, html)
+            line = serialize_record(parsed, self.storage.timestamp())
+            self.logger.debug("ok: %s", url)
+            return line
+        except Exception as exc:  # noqa: BLE001 - surface errors
+            self.logger.error("fail: %s -> %s", url, exc)
+            return None
@@ -1,16 +1,49 @@
 from __future__ import annotations
 
 import json
+import random
+import threading
 import time
-import urllib.error
-import urllib.request
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    # 可选依赖；未安装时回退到标准库json
+    orjson = None
+
+# orjson 和标准库 json 都能直接解析 UTF-8 字节串
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+# 重试退避：full jitter，在 [0, min(上限, 基数 * 2**attempt)] 内随机等待，
+# 避免多个线程对同一故障源同步重试
+_BACKOFF_BASE = 1.0
+_BACKOFF_CAP = 4.0
+# 4xx 中值得重试的状态码（超时、限流），其余客户端错误直接抛出
+_RETRYABLE_CLIENT_ERRORS = frozenset({408, 429})
+# 流式读取正文的块大小
+_CHUNK_SIZE = 64 * 1024
+
+# (ETag, Last-Modified, 原始正文, 声明的 charset)
+_CacheEntry = Tuple[Optional[str], Optional[str], bytes, Optional[str]]
 
 
 class HttpClient:
     """轻量级 HTTP 客户端，支持重试与超时
 
-    使用标准库 `urllib.request`，避免额外依赖；提供基本的文本和 JSON 请求
+    基于 `requests.Session`，连接池在请求间复用 TCP/TLS 连接，可安全地被
+    `Crawler` 的多个线程共享；提供基本的文本和 JSON 请求。
+
+    带 ETag/Last-Modified 的响应最多缓存 `cache_size` 个 URL、共 `cache_bytes`
+    字节正文，再次请求时发送条件请求，服务器返回 304 时直接使用缓存内容；
+    `cache_size=0` 或 `cache_bytes=0` 关闭缓存。
+
+    正文按块流式读取，超过 `max_bytes` 的部分直接丢弃，避免超大响应占满内存；
+    `max_bytes=0` 表示不限制
     """
 
     def __init__(
@@ -18,34 +51,144 @@ class HttpClient:
         timeout: float = 15.0,
         retries: int = 2,
         user_agent: str = "aerolopa-crawler/0.1 (+https://example.com)",
+        pool_size: int = 10,
+        cache_size: int = 512,
+        cache_bytes: int = 32 * 1024 * 1024,
+        max_bytes: int = 8 * 1024 * 1024,
     ) -> None:
         self.timeout = timeout
         self.retries = max(0, retries)
         self.user_agent = user_agent
+        self.max_bytes = max(0, max_bytes)
+
+        self._session = requests.Session()
+        self._session.headers["User-Agent"] = user_agent
+        # 每个主机最多保留 pool_size 个空闲连接，与抓取线程数相当即可
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+        # URL -> (ETag, Last-Modified, 原始正文, 声明的 charset)，按最近使用排序
+        self._cache_size = max(0, cache_size) if cache_bytes > 0 else 0
+        self._cache_bytes = max(0, cache_bytes)
+        self._cache_used = 0
+        self._cache: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def close(self) -> None:
+        self._session.close()
+
+    def get_text(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        max_bytes: Optional[int] = None,
+    ) -> str:
+        raw, charset = self._get_raw(url, headers, max_bytes)
+        # 与标准库行为一致：未声明 charset 时按 UTF-8 解码
+        return raw.decode(charset or "utf-8", errors="replace")
+
+    def _get_raw(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        max_bytes: Optional[int] = None,
+    ) -> Tuple[bytes, Optional[str]]:
+        """请求 URL，返回 (原始正文, Content-Type 中声明的 charset 或 None)
 
-    def _build_request(
-        self, url: str, headers: Optional[Dict[str, str]] = None
-    ) -> urllib.request.Request:
-        hdrs = {"User-Agent": self.user_agent}
-        if headers:
-            hdrs.update(headers)
-        return urllib.request.Request(url, headers=hdrs, method="GET")
+        `max_bytes` 为 None 时使用实例的 `max_bytes`；截断的正文不会被缓存。
+        """
+        limit = self.max_bytes if max_bytes is None else max(0, max_bytes)
+        cached = self._cache_get(url)
+        if cached is not None:
+            etag, last_modified, _, _ = cached
+            headers = dict(headers or {})
+            if etag:
+                headers.setdefault("If-None-Match", etag)
+            if last_modified:
+                headers.setdefault("If-Modified-Since", last_modified)
 
-    def get_text(self, url: str, headers: Optional[Dict[str, str]] = None) -> str:
         attempt = 0
         while True:
             try:
-                req = self._build_request(url, headers)
-                with urllib.request.urlopen(req, timeout=self.timeout) as resp:
-                    charset = resp.headers.get_content_charset() or "utf-8"
-                    return resp.read().decode(charset, errors="replace")
-            except (urllib.error.URLError, urllib.error.HTTPError):
-                if attempt >= self.retries:
+                resp = self._session.get(url, headers=headers, timeout=self.timeout, stream=True)
+                try:
+                    if resp.status_code == 304 and cached is not None:
+                        raw = cached[2]
+                        return (raw[:limit] if limit else raw), cached[3]
+                    resp.raise_for_status()
+                    charset = resp.encoding if "charset=" in resp.headers.get("Content-Type", "") else None
+                    raw, complete = _read_body(resp, limit)
+                finally:
+                    # 未读完的连接直接关闭，读完的归还连接池
+                    resp.close()
+                if complete:
+                    self._cache_put(
+                        url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"), raw, charset
+                    )
+                return raw, charset
+            except requests.RequestException as exc:
+                if attempt >= self.retries or not _is_retryable(exc):
                     raise
-                backoff = min(2**attempt, 4)
-                time.sleep(backoff)
+                time.sleep(random.uniform(0, min(_BACKOFF_CAP, _BACKOFF_BASE * 2**attempt)))
                 attempt += 1
 
+    def _cache_get(self, url: str) -> Optional[_CacheEntry]:
+        if not self._cache_size:
+            return None
+        with self._cache_lock:
+            entry = self._cache.get(url)
+            if entry is not None:
+                self._cache.move_to_end(url)
+            return entry
+
+    def _cache_put(
+        self,
+        url: str,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        raw: bytes,
+        charset: Optional[str],
+    ) -> None:
+        if not self._cache_size:
+            return
+        with self._cache_lock:
+            old = self._cache.pop(url, None)
+            if old is not None:
+                self._cache_used -= len(old[2])
+            if (not etag and not last_modified) or len(raw) > self._cache_bytes:
+                # 无验证器的响应无法发起条件请求；超过总容量的正文也不缓存
+                return
+            self._cache[url] = (etag, last_modified, raw, charset)
+            self._cache_used += len(raw)
+            while len(self._cache) > self._cache_size or self._cache_used > self._cache_bytes:
+                _, evicted = self._cache.popitem(last=False)
+                self._cache_used -= len(evicted[2])
+
     def get_json(self, url: str, headers: Optional[Dict[str, str]] = None) -> object:
-        text = self.get_text(url, headers=headers)
-        return json.loads(text)
+        raw, charset = self._get_raw(url, headers)
+        # JSON 默认为 UTF-8：直接解析字节串，省去解码为 str 的一遍
+        if charset is None or charset.lower().replace("_", "-") in ("utf-8", "utf8"):
+            return _json_loads(raw)
+        return json.loads(raw.decode(charset, errors="replace"))
+
+
+def _is_retryable(exc: requests.RequestException) -> bool:
+    """连接错误、超时和 5xx 可重试；除 408/429 外的 4xx 属于永久失败"""
+    response = getattr(exc, "response", None)
+    if response is None:
+        return True
+    status = response.status_code
+    return status >= 500 or status in _RETRYABLE_CLIENT_ERRORS
+
+
+def _read_body(resp: requests.Response, limit: int) -> Tuple[bytes, bool]:
+    """按块读取正文，最多保留 `limit` 字节（0 表示不限制），返回 (正文, 是否完整)"""
+    if not limit:
+        return resp.content, True
+    buf = bytearray()
+    for chunk in resp.iter_content(_CHUNK_SIZE):
+        buf += chunk
+        if len(buf) > limit:
+            return bytes(buf[:limit]), False
+    return bytes(buf), True
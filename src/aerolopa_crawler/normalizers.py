@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any, Dict
 
+from .storage import encode_line
+
 
 def normalize_record(record: Dict[str, Any]) -> Dict[str, Any]:
     """Normalize parsed records to a stable schema.
@@ -10,7 +12,19 @@ def normalize_record(record: Dict[str, Any]) -> Dict[str, Any]:
     - Ensure required keys
     - Add defaults for missing optional fields
     """
-    out: Dict[str, Any] = {}
+    return _normalize_into({}, record)
+
+
+def serialize_record(record: Dict[str, Any], ts: str) -> bytes:
+    """Normalize a parsed record straight into one JSON line stamped with `_ts`.
+
+    Produces the same line `Storage` writes for `normalize_record(record)`,
+    without building the intermediate normalized dict.
+    """
+    return encode_line(_normalize_into({"_ts": ts}, record))
+
+
+def _normalize_into(out: Dict[str, Any], record: Dict[str, Any]) -> Dict[str, Any]:
     out["url"] = str(record.get("url", "")).strip()
     title = record.get("title")
     out["title"] = str(title).strip() if isinstance(title, str) else title
@@ -21,4 +35,3 @@ def normalize_record(record: Dict[str, Any]) -> Dict[str, Any]:
         if k not in out:
             out[k] = v
     return out
-
@@ -10,10 +10,17 @@ class AerolopaParser:
     依赖最小化：提取页面标题，并返回包含 URL 与内容长度的基础记录
     """
 
-    _TITLE_RE = re.compile(r"<title>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+    # 允许 <title> 带属性；正则在类定义时编译一次
+    _TITLE_RE = re.compile(r"<title(?:\s[^>]*)?>(.*?)</title>", re.IGNORECASE | re.DOTALL)
+
+    # 只在文档头部查找 </head>，超出范围则视为没有
+    _HEAD_SCAN_LIMIT = 32768
 
     def parse(self, url: str, html: str) -> Dict[str, Any]:
-        m = self._TITLE_RE.search(html)
+        # <title> 位于 <head> 内：找到 </head> 时只扫描其之前的部分，
+        # 否则（无 head 或标签大小写不同）回退到全文
+        head_end = html.find("</head>", 0, self._HEAD_SCAN_LIMIT)
+        m = self._TITLE_RE.search(html, 0, head_end if head_end != -1 else len(html))
         title = m.group(1).strip() if m else None
         return {
             "url": url,
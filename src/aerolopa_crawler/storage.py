@@ -1,31 +1,87 @@
 from __future__ import annotations
 
+import atexit
 import json
 import os
-from datetime import datetime
-from typing import Any, Dict
+import threading
+import time
+from typing import Any, Dict, Iterable, Tuple
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    # Optional dependency; fall back to the stdlib encoder.
+    orjson = None
+
+
+def encode_line(obj: Dict[str, Any]) -> bytes:
+    """Encode a record as one UTF-8 JSON line, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS)
+    return (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
+
+
+# (whole second, formatted `_ts`), replaced as one tuple so threads never see
+# a mismatched pair
+_ts_cache: Tuple[int, str] = (-1, "")
 
 
 class Storage:
     """Simple storage that writes JSON Lines to a file.
 
-    Files are appended to `<output_dir>/results.jsonl`.
+    Records are appended to `<output_dir>/results.jsonl` through one file
+    handle kept open for the lifetime of the instance. Writes are serialized
+    so concurrent crawler threads never interleave lines, and each call is
+    flushed so a batch reaches the file in a single write.
     """
 
     def __init__(self, output_dir: str = "data") -> None:
         self.output_dir = output_dir
         os.makedirs(self.output_dir, exist_ok=True)
         self._path = os.path.join(self.output_dir, "results.jsonl")
+        self._lock = threading.Lock()
+        self._fh = open(self._path, "ab")
+        atexit.register(self.close)
 
     @property
     def path(self) -> str:
         return self._path
 
+    def close(self) -> None:
+        with self._lock:
+            if not self._fh.closed:
+                self._fh.close()
+
+    def __enter__(self) -> "Storage":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    @staticmethod
+    def timestamp() -> str:
+        """Current UTC time in the `_ts` format, formatted at most once a second."""
+        global _ts_cache
+        now = int(time.time())
+        cached_second, cached_value = _ts_cache
+        if cached_second != now:
+            cached_value = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now))
+            _ts_cache = (now, cached_value)
+        return cached_value
+
     def write(self, record: Dict[str, Any]) -> None:
-        payload = {
-            "_ts": datetime.utcnow().isoformat(timespec="seconds") + "Z",
-            **record,
-        }
-        with open(self._path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(payload, ensure_ascii=False) + "\n")
+        self.write_many((record,))
+
+    def write_many(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Append several records with a single write."""
+        ts = self.timestamp()
+        self.write_serialized(encode_line({"_ts": ts, **record}) for record in records)
 
+    def write_serialized(self, lines: Iterable[bytes]) -> None:
+        """Append already encoded JSON lines (see `encode_line`)."""
+        data = b"".join(lines)
+        if not data:
+            return
+        with self._lock:
+            self._fh.write(data)
+            self._fh.flush()
@@ -2,14 +2,16 @@ from __future__ import annotations
 
 import threading
 import time
-from typing import Optional
+from typing import Dict, Optional
 
 
 class Throttle:
     """Simple wall-clock throttle to respect crawl delays.
 
     Ensures at least `delay` seconds between successive `wait()` calls
-    across threads in a single process.
+    across threads in a single process. Each caller reserves the next slot
+    on the schedule under the lock and sleeps outside it, so waiting threads
+    do not hold the lock while sleeping.
     """
 
     def __init__(self, delay: float) -> None:
@@ -22,11 +24,66 @@ class Throttle:
             return
         with self._lock:
             now = time.monotonic()
-            if self._last_at is None:
-                self._last_at = now
-                return
-            elapsed = now - self._last_at
-            remaining = self.delay - elapsed
-            if remaining > 0:
-                time.sleep(remaining)
-            self._last_at = time.monotonic()
+            slot = now if self._last_at is None else max(now, self._last_at + self.delay)
+            self._last_at = slot
+        remaining = slot - time.monotonic()
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def wait_for(self, host: str) -> None:
+        """Same as `wait()`; a single Throttle spaces requests to all hosts."""
+        self.wait()
+
+
+class ThrottleRegistry:
+    """Per-host throttles sharing one crawl delay.
+
+    `wait_for(host)` spaces requests to the same host by `delay` seconds
+    while requests to different hosts proceed independently. Throttles are
+    created lazily on first use of a host.
+    """
+
+    def __init__(self, delay: float) -> None:
+        self.delay = max(0.0, delay)
+        self._by_host: Dict[str, Throttle] = {}
+        self._reg_lock = threading.Lock()
+
+    def wait_for(self, host: str) -> None:
+        throttle = self._by_host.get(host)
+        if throttle is None:
+            with self._reg_lock:
+                throttle = self._by_host.get(host)
+                if throttle is None:
+                    throttle = self._by_host[host] = Throttle(self.delay)
+        throttle.wait()
+
+
+class RateLimiter:
+    """Thread-safe token bucket shared by concurrent workers.
+
+    Allows bursts of up to `capacity` calls and refills at `rate` tokens per
+    second, so the aggregate request rate stays bounded regardless of how
+    many threads are fetching. Each caller reserves its token under the lock
+    and sleeps outside it, so waiting workers do not block each other.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = max(0.0, rate)
+        self.capacity = max(1.0, self.rate if capacity is None else capacity)
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+
+    def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated_at) * self.rate
+            )
+            self._updated_at = now
+            self._tokens -= 1.0
+            remaining = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if remaining > 0:
+            time.sleep(remaining)
@@ -17,8 +17,6 @@ from pathlib import Path
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from app import app
-
 
 def get_system_info():
     """获取系统信息"""
@@ -38,12 +36,21 @@ def start_with_gunicorn(host='0.0.0.0', port=8000, workers=4):
         print(f"📍 地址: http://{host}:{port}")
         print(f"👥 工作进程: {workers}")
         
+        # 安装了 gevent 时 gunicorn.conf.py 会选用 gevent worker，它在 fork 之后
+        # 才 monkey patch，此时不能在 master 中预加载应用
+        try:
+            import gevent  # noqa: F401
+            preload = []
+        except ImportError:
+            preload = ['--preload']
+        
         # 构建gunicorn参数
         sys.argv = [
             'gunicorn',
             '--bind', f'{host}:{port}',
             '--workers', str(workers),
             '--timeout', '120',
+            *preload,
             '--access-logfile', '-',
             '--error-logfile', '-',
             '--log-level', 'info',
@@ -62,6 +69,8 @@ def start_with_gunicorn(host='0.0.0.0', port=8000, workers=4):
 
 def start_with_waitress(host='0.0.0.0', port=8000, threads=4):
     """使用Waitress启动服务（Windows）"""
+    from app import app
+    
     try:
         from waitress import serve
         
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import io
+from dataclasses import replace
+from pathlib import Path
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from aerolopa_crawler.aerolopa_crawler import AerolopaCrawler
+from aerolopa_crawler.config import Config, CrawlerConfig, ImageConfig, load_config
+from aerolopa_crawler.throttle import RateLimiter
+
+
+# 为本文件的所有测试应用标记
+pytestmark = [pytest.mark.unit, pytest.mark.crawler]
+
+
+@pytest.fixture
+def crawler(tmp_path: Path):
+    config = Config(
+        crawler=CrawlerConfig(output_dir=str(tmp_path), fast_parser=False),
+        image=ImageConfig(cache_dir=str(tmp_path / "images")),
+    )
+    c = AerolopaCrawler(config)
+    yield c
+    c.close()
+
+
+def test_seat_map_images_undeclared_charset_is_utf8(crawler):
+    html = '<html><body><img src="/img/Économie-seat-A320.jpg"></body></html>'.encode("utf-8")
+    urls = crawler._extract_seat_map_images(html, "https://example.com/a320", None)
+    assert urls == ["https://example.com/img/Économie-seat-A320.jpg"]
+
+
+def test_iter_links_undeclared_charset_is_utf8(crawler):
+    html = '<a href="/airline/ö">Lufthansa – Ö</a>'.encode("utf-8")
+    links = list(crawler._iter_links(html, ('a[href*="airline"]',)))
+    assert links == [("/airline/ö", "Lufthansa – Ö")]
+
+
+def test_rate_limit_derived_from_delay_unless_rps_set():
+    assert CrawlerConfig().rate_limit() == (1.0, 1.0)
+    assert CrawlerConfig(delay=2.0).rate_limit() == (0.5, 1.0)
+    assert CrawlerConfig(delay=2.0, rps=4.0).rate_limit() == (4.0, 4.0)
+    assert CrawlerConfig(delay=0.0).rate_limit() == (0.0, 1.0)
+
+
+def test_malformed_rps_falls_back_to_delay(monkeypatch):
+    monkeypatch.setenv("AEROLOPA_RPS", "abc")
+    monkeypatch.setenv("AEROLOPA_DELAY", "2")
+    load_config.cache_clear()
+    try:
+        assert load_config().crawler.rate_limit() == (0.5, 1.0)
+    finally:
+        load_config.cache_clear()
+
+
+def test_download_image_enforces_max_bytes_without_content_length(crawler, monkeypatch):
+    crawler.config = replace(crawler.config, image=replace(crawler.config.image, max_bytes=10))
+    crawler._limiter = RateLimiter(0)
+    calls = []
+
+    def fake_get(url, timeout=None, stream=False):
+        calls.append(url)
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.headers = CaseInsensitiveDict({"Content-Type": "image/jpeg"})
+        resp.raw = io.BytesIO(b"x" * (8 if url.endswith("small.jpg") else 20000))
+        return resp
+
+    monkeypatch.setattr(crawler.session, "get", fake_get)
+    assert crawler._download_image("https://example.com/big.jpg", "CA", "big.jpg") is None
+    assert not (crawler._cache_dir / "CA" / "big.jpg").exists()
+    path = crawler._download_image("https://example.com/small.jpg", "CA", "small.jpg")
+    assert Path(path).read_bytes() == b"x" * 8
+    assert len(calls) == 2
+
+
+def test_aircraft_url_claimed_once_across_threads(crawler):
+    from concurrent.futures import ThreadPoolExecutor
+
+    url = "https://example.com/aircraft/a320"
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        claims = list(pool.map(lambda _: crawler._claim_url(url), range(32)))
+    assert claims.count(True) == 1
+    crawler._release_url(url)
+    assert crawler._claim_url(url)
@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+import pytest
+
+from aerolopa_crawler.airlines import AirlineManager
+
+# 为本文件的所有测试应用标记
+pytestmark = [pytest.mark.unit]
+
+
+def test_managers_sharing_data_see_each_others_changes():
+    first, second = AirlineManager(), AirlineManager()
+    assert "QQ" not in second.get_supported_iata_codes()
+    first.add_airline("qq", "测试航空", "Test Airways")
+    try:
+        assert "QQ" in second.get_supported_iata_codes()
+        assert second.search_by_name("test airways") == [("QQ", "测试航空", "Test Airways")]
+    finally:
+        first.remove_airline("QQ")
+    assert "QQ" not in second.get_supported_iata_codes()
+    assert second.search_by_name("test airways") == []
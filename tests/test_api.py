@@ -10,6 +10,7 @@ Version: 1.0.0
 Date: 2024
 """
 
+import os
 import json
 import unittest
 import tempfile
@@ -24,9 +25,21 @@ pytestmark = [pytest.mark.api, pytest.mark.integration]
 from src.aerolopa_crawler.api.app import create_app
 from src.aerolopa_crawler.api.validators import (
     validate_iata_code,
+    validate_iata_code_with_message,
     validate_aircraft_model,
+    validate_request_params,
 )
-from src.aerolopa_crawler.api.utils import standardize_aircraft_model
+from src.aerolopa_crawler.api.utils import (
+    clear_cache_directory,
+    generate_cache_key,
+    get_cached_image,
+    save_cached_image,
+    save_cached_image_async,
+    standardize_aircraft_model,
+)
+from src.aerolopa_crawler.api.decorators import error_handler, rate_limit
+from src.aerolopa_crawler.api.exceptions import APIError
+from src.aerolopa_crawler.api.ratelimit import SlidingWindowLimiter
 
 
 class TestAPIValidation(unittest.TestCase):
@@ -40,13 +53,30 @@ class TestAPIValidation(unittest.TestCase):
             result = validate_iata_code(code)
             self.assertTrue(result[0], f"IATA代码 {code} 应该有效")
 
+        # 含数字的代码（如 3K）同样有效，但不能全是数字
+        for code in ["3K", "3k", "9W", "CA1"]:
+            self.assertTrue(validate_iata_code(code)[0], f"IATA代码 {code} 应该有效")
+            self.assertEqual(validate_iata_code_with_message(code), code.upper())
+
         # 无效的IATA代码
-        invalid_codes = ["", "A", "ABCD", "123", "a1", "CA1"]
+        invalid_codes = ["", "A", "ABCD", "123", "12", "C-", "CA\n"]
         for code in invalid_codes:
             if code is not None:  # 跳过None值测试，因为会导致TypeError
                 result = validate_iata_code(code)
                 self.assertFalse(result[0], f"IATA代码 {code} 应该无效")
 
+    def test_validate_request_params_rejects_unsupported_airline(self):
+        """测试未经验证器处理的非字符串或小写航空公司代码返回400"""
+        from flask import Flask
+
+        app = Flask(__name__)
+        for airline in (123, ["CA"], "ca"):
+            with app.test_request_context("/", method="POST", json={"airline": airline}):
+                with self.assertRaises(APIError) as ctx:
+                    validate_request_params({"airline": None})
+            self.assertEqual(ctx.exception.status_code, 400)
+            self.assertEqual(ctx.exception.error_code, "AIRLINE_NOT_SUPPORTED")
+
     def test_validate_aircraft_model(self):
         """测试机型验证"""
         # 有效的机型（字母、数字、连字符和空格）
@@ -220,5 +250,70 @@ class TestAPIEndpoints(unittest.TestCase):
             self.assertIn("error", data)
 
 
+class TestRateLimit(unittest.TestCase):
+    """限流测试"""
+
+    def test_rate_limit_sets_retry_headers(self):
+        """测试超限时返回429和Retry-After/RateLimit-*头"""
+        from flask import Flask
+
+        app = Flask(__name__)
+
+        @app.route("/limited")
+        @error_handler
+        @rate_limit(max_requests=2, window_seconds=60)
+        def limited():
+            return "ok"
+
+        client = app.test_client()
+        with patch(
+            "src.aerolopa_crawler.api.decorators.get_rate_limiter",
+            return_value=SlidingWindowLimiter(),
+        ):
+            self.assertEqual(client.get("/limited").status_code, 200)
+            self.assertEqual(client.get("/limited").status_code, 200)
+            response = client.get("/limited")
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers["RateLimit-Limit"], "2")
+        self.assertEqual(response.headers["RateLimit-Remaining"], "0")
+        self.assertGreater(int(response.headers["Retry-After"]), 0)
+        self.assertEqual(json.loads(response.data)["error"]["code"], "TOO_MANY_REQUESTS")
+
+
+class TestImageCache(unittest.TestCase):
+    """优化图片缓存测试"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_save_cached_image_replaces_atomically(self):
+        """测试缓存写入不留临时文件，读取到的是完整内容"""
+        self.assertTrue(save_cached_image(self.cache_dir, "key", b"old"))
+        self.assertTrue(save_cached_image(self.cache_dir, "key", b"new-data"))
+        self.assertEqual(os.listdir(self.cache_dir), ["key.jpg"])
+        self.assertEqual(get_cached_image(self.cache_dir, "key", 60), b"new-data")
+
+    def test_clear_cache_directory_keeps_crawler_files(self):
+        """测试清理缓存只删除优化图片缓存，保留数据库等文件"""
+        save_cached_image(self.cache_dir, generate_cache_key("CA", "a.jpg"), b"data")
+        for name in ("seatmaps.db", "seatmaps.db-wal", "downloaded.txt", "CA_A320.jpg"):
+            with open(os.path.join(self.cache_dir, name), "wb") as f:
+                f.write(b"keep")
+        self.assertEqual(clear_cache_directory(self.cache_dir), 1)
+        self.assertEqual(
+            sorted(os.listdir(self.cache_dir)),
+            ["CA_A320.jpg", "downloaded.txt", "seatmaps.db", "seatmaps.db-wal"],
+        )
+
+    def test_save_cached_image_async_skips_duplicate_key(self):
+        """测试同一缓存键排队期间不会重复提交"""
+        with patch("src.aerolopa_crawler.api.utils._cache_write_pending", {"busy"}):
+            self.assertFalse(save_cached_image_async(self.cache_dir, "busy", b"data"))
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -38,3 +38,19 @@ def test_crawler_processes_and_writes(tmp_path: Path):
     data = [json.loads(line) for line in out.read_text(encoding="utf-8").splitlines()]
     assert data and data[0]["title"] == "Unit Test"
 
+
+def test_crawler_runs_urls_concurrently(tmp_path: Path):
+    html = "<html><head><title>Unit Test</title></head><body>Hello</body></html>"
+    storage = Storage(output_dir=str(tmp_path))
+    c = Crawler(
+        client=DummyHttpClient(html),
+        parser=AerolopaParser(),
+        storage=storage,
+        throttle=Throttle(delay=0.0),
+        max_workers=4,
+    )
+    urls = [f"https://example.com/{i}" for i in range(20)]
+    assert c.run(urls + ["  ", "", urls[0], f" {urls[1]} "]) == 20
+
+    lines = Path(storage.path).read_text(encoding="utf-8").splitlines()
+    assert sorted(json.loads(line)["url"] for line in lines) == sorted(urls)
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import io
+import pytest
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from aerolopa_crawler import http
+from aerolopa_crawler.http import HttpClient
+
+# 为本文件的所有测试应用标记
+pytestmark = [pytest.mark.unit]
+
+
+def make_response(status: int, body: bytes = b"", headers=None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp.reason = "test"
+    resp.url = "https://example.com/"
+    resp.headers = CaseInsensitiveDict(headers or {})
+    resp.raw = io.BytesIO(body)
+    return resp
+
+
+class FakeSession:
+    """按顺序返回预设响应，并记录每次请求的请求头"""
+
+    def __init__(self, *responses: requests.Response) -> None:
+        self.responses = list(responses)
+        self.calls = []
+
+    def get(self, url, headers=None, timeout=None, stream=False):
+        self.calls.append(dict(headers or {}))
+        return self.responses.pop(0)
+
+
+def make_client(session: FakeSession, **kwargs) -> HttpClient:
+    client = HttpClient(**kwargs)
+    client._session = session
+    return client
+
+
+def test_not_modified_reuses_cached_body():
+    session = FakeSession(
+        make_response(200, b"<html>v1</html>", {"ETag": '"v1"'}),
+        make_response(304),
+    )
+    client = make_client(session)
+    assert client.get_text("https://example.com/") == "<html>v1</html>"
+    assert client.get_text("https://example.com/") == "<html>v1</html>"
+    assert session.calls[1]["If-None-Match"] == '"v1"'
+
+
+def test_client_errors_are_not_retried(monkeypatch):
+    monkeypatch.setattr(http.time, "sleep", lambda _: None)
+    session = FakeSession(make_response(404), make_response(200, b"ok"))
+    client = make_client(session, retries=2)
+    with pytest.raises(requests.HTTPError):
+        client.get_text("https://example.com/")
+    assert len(session.calls) == 1
+
+    session = FakeSession(make_response(503), make_response(200, b"ok"))
+    client = make_client(session, retries=2)
+    assert client.get_text("https://example.com/") == "ok"
+    assert len(session.calls) == 2
+
+
+def test_truncated_body_is_not_cached():
+    session = FakeSession(
+        make_response(200, b"x" * 100, {"ETag": '"big"'}),
+        make_response(200, b"y" * 100, {"ETag": '"big"'}),
+    )
+    client = make_client(session, max_bytes=10)
+    assert client.get_text("https://example.com/") == "x" * 10
+    assert client.get_text("https://example.com/") == "y" * 10
+    assert "If-None-Match" not in session.calls[1]
+
+
+def test_cache_is_bounded_by_total_bytes():
+    session = FakeSession(*(
+        make_response(200, b"z" * 40, {"ETag": f'"{i}"'}) for i in range(3)
+    ))
+    client = make_client(session, cache_bytes=100)
+    for i in range(3):
+        client.get_text(f"https://example.com/{i}")
+    assert list(client._cache) == ["https://example.com/1", "https://example.com/2"]
+    assert client._cache_used == 80
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+import json
+
 import pytest
 
 # 为本文件的所有测试应用标记
 pytestmark = [pytest.mark.unit]
 
-from aerolopa_crawler.normalizers import normalize_record
+from aerolopa_crawler.normalizers import normalize_record, serialize_record
 
 
 def test_normalize_record_trims_and_defaults():
@@ -23,3 +25,9 @@ def test_normalize_record_trims_and_defaults():
     assert out["source"] == "unit"
     assert out["extra"] == 123
 
+
+def test_serialize_record_matches_normalize_record():
+    rec = {"url": " https://example.com/ ", "title": " T ", "_source": "unit", "extra": 1}
+    line = serialize_record(rec, "2024-01-01T00:00:00Z")
+    assert line.endswith(b"\n")
+    assert json.loads(line) == {"_ts": "2024-01-01T00:00:00Z", **normalize_record(rec)}
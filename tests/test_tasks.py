@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import threading
+import pytest
+
+from aerolopa_crawler.api import tasks
+from aerolopa_crawler.api.exceptions import APIError
+
+# 为本文件的所有测试应用标记
+pytestmark = [pytest.mark.unit, pytest.mark.api]
+
+
+@pytest.fixture
+def fake_crawl(monkeypatch):
+    """用可控的假爬取替换真实爬取，强制使用进程内线程池"""
+    release = threading.Event()
+    calls = []
+
+    def crawl_airline(airline):
+        calls.append(airline)
+        release.wait(5)
+        if airline == "XX":
+            raise RuntimeError("boom")
+        return "cache"
+
+    def seatmap_result(cache_dir, airline, aircraft):
+        return {"airline": airline, "aircraft": aircraft, "images": [], "count": 0}
+
+    monkeypatch.setattr(tasks, "crawl_seatmap_task", None)
+    monkeypatch.setattr(tasks, "celery_app", None)
+    monkeypatch.setattr(tasks, "_crawl_airline", crawl_airline)
+    monkeypatch.setattr(tasks, "_seatmap_result", seatmap_result)
+    monkeypatch.setattr(tasks, "_local_tasks", type(tasks._local_tasks)())
+    monkeypatch.setattr(tasks, "_airline_crawls", {})
+    yield release, calls
+    release.set()
+
+
+def test_submit_and_wait_returns_result(fake_crawl):
+    release, calls = fake_crawl
+    release.set()
+    task_id = tasks.submit_crawl("CA", "A320")
+    result = tasks.wait_for_task(task_id, 5)
+    assert result["aircraft"] == "A320"
+    assert calls == ["CA"]
+    assert tasks.get_task_status(task_id)["state"] == "SUCCESS"
+
+
+def test_wait_timeout_leaves_task_running(fake_crawl):
+    release, _ = fake_crawl
+    task_id = tasks.submit_crawl("CA", "A320")
+    assert tasks.wait_for_task(task_id, 0.05) is None
+    assert tasks.get_task_status(task_id)["state"] in ("PENDING", "STARTED")
+    release.set()
+    assert tasks.wait_for_task(task_id, 5) is not None
+
+
+def test_failed_and_unknown_task_status(fake_crawl):
+    release, _ = fake_crawl
+    release.set()
+    task_id = tasks.submit_crawl("XX", "A320")
+    with pytest.raises(RuntimeError):
+        tasks.wait_for_task(task_id, 5)
+    status = tasks.get_task_status(task_id)
+    assert status["state"] == "FAILURE" and status["error"] == "boom"
+    assert tasks.get_task_status("no-such-task") is None
+
+
+def test_oldest_local_tasks_are_evicted(fake_crawl, monkeypatch):
+    release, _ = fake_crawl
+    release.set()
+    monkeypatch.setattr(tasks, "_MAX_LOCAL_TASKS", 2)
+    ids = [tasks.submit_crawl(f"C{i}", "A320") for i in range(3)]
+    assert tasks.get_task_status(ids[0]) is None
+    for task_id in ids[1:]:
+        tasks.wait_for_task(task_id, 5)
+    assert all(tasks.get_task_status(task_id) for task_id in ids[1:])
+
+
+def test_same_airline_shares_one_crawl(fake_crawl):
+    release, calls = fake_crawl
+    first = tasks.submit_crawl("CA", "A320")
+    second = tasks.submit_crawl("CA", "B737")
+    release.set()
+    assert tasks.wait_for_task(first, 5)["aircraft"] == "A320"
+    assert tasks.wait_for_task(second, 5)["aircraft"] == "B737"
+    assert calls == ["CA"]
+
+
+def test_rejects_when_backlog_is_full(fake_crawl, monkeypatch):
+    monkeypatch.setattr(tasks, "MAX_PENDING_CRAWLS", 2)
+    tasks.submit_crawl("CA", "A320")
+    tasks.submit_crawl("MU", "A320")
+    # 已在进行中的航空公司仍可加入
+    tasks.submit_crawl("CA", "B737")
+    with pytest.raises(APIError) as excinfo:
+        tasks.submit_crawl("CZ", "A320")
+    assert excinfo.value.status_code == 503
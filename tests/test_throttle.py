@@ -6,7 +6,7 @@ import pytest
 # 为本文件的所有测试应用标记
 pytestmark = [pytest.mark.unit]
 
-from aerolopa_crawler.throttle import Throttle
+from aerolopa_crawler.throttle import RateLimiter, Throttle, ThrottleRegistry
 
 
 def test_throttle_enforces_minimum_delay():
@@ -17,3 +17,25 @@ def test_throttle_enforces_minimum_delay():
     elapsed = time.perf_counter() - start
     assert elapsed >= 0.03 - 0.005  # allow tiny scheduling tolerance
 
+
+def test_rate_limiter_allows_burst_then_limits_rate():
+    limiter = RateLimiter(rate=50.0, capacity=2)
+    start = time.perf_counter()
+    limiter.acquire()
+    limiter.acquire()
+    burst = time.perf_counter() - start
+    for _ in range(3):
+        limiter.acquire()
+    elapsed = time.perf_counter() - start
+    assert burst < 0.02
+    assert elapsed >= 3 / 50.0 - 0.005
+
+
+def test_throttle_registry_spaces_same_host_only():
+    registry = ThrottleRegistry(delay=0.05)
+    start = time.perf_counter()
+    registry.wait_for("a.example")
+    registry.wait_for("b.example")
+    assert time.perf_counter() - start < 0.04
+    registry.wait_for("a.example")
+    assert time.perf_counter() - start >= 0.05 - 0.005